@@ -0,0 +1,102 @@
+import math
+import re
+import threading
+
+# Starting characters-per-token estimates by model family, refined at runtime
+# from the prompt_eval_count Ollama reports for real requests
+DEFAULT_CHARS_PER_TOKEN = 4.0
+MODEL_CHARS_PER_TOKEN = {"qwen": 3.6, "llama": 3.8, "mistral": 3.5, "gemma": 3.8, "phi": 3.5}
+# Chat-template tokens Ollama adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TASK_TOKEN_BUDGETS = {"shopping": 600, "question": 500, "report": 800}
+
+_calibrated = {}
+_calibration_lock = threading.Lock()
+
+def chars_per_token(model):
+    with _calibration_lock:
+        if model in _calibrated:
+            return _calibrated[model]
+    family = model.split(":")[0].lower()
+    for prefix, ratio in MODEL_CHARS_PER_TOKEN.items():
+        if family.startswith(prefix):
+            return ratio
+    return DEFAULT_CHARS_PER_TOKEN
+
+def record_prompt(model, messages, prompt_tokens):
+    """Refine the model's chars-per-token ratio from a measured prompt"""
+    content_tokens = prompt_tokens - MESSAGE_OVERHEAD_TOKENS * len(messages)
+    chars = sum(len(message.get("content", "")) for message in messages)
+    if content_tokens <= 0 or chars < 200:
+        return
+    ratio = chars / content_tokens
+    # Ollama reuses cached prompt prefixes, which makes prompt_eval_count too small
+    if not 2.0 <= ratio <= 6.0:
+        return
+    current = chars_per_token(model)
+    with _calibration_lock:
+        _calibrated[model] = 0.8 * current + 0.2 * ratio
+
+class ContextBuilder:
+    """Dedupes, ranks and packs snippets into a per-task token budget"""
+
+    def __init__(self, model, budgets=None):
+        self.model = model
+        self.budgets = dict(TASK_TOKEN_BUDGETS)
+        if budgets:
+            self.budgets.update(budgets)
+
+    def count_tokens(self, text):
+        return math.ceil(len(text) / chars_per_token(self.model))
+
+    def build(self, snippets, query="", task=None, budget_tokens=None, separator="\n"):
+        budget = budget_tokens or self.budgets.get(task, 512)
+        ratio = chars_per_token(self.model)
+        separator_tokens = self.count_tokens(separator)
+        selected = []
+        used = 0
+        for snippet in self._rank(self._dedupe(snippets), query):
+            cost = self.count_tokens(snippet) + (separator_tokens if selected else 0)
+            if used + cost <= budget:
+                selected.append(snippet)
+                used += cost
+                continue
+            remaining = budget - used - separator_tokens
+            if remaining >= 16:
+                selected.append(snippet[:int(remaining * ratio)].rstrip() + "...")
+            break
+        return separator.join(selected)
+
+    def _dedupe(self, snippets):
+        kept = []
+        kept_words = []
+        for snippet in snippets:
+            text = " ".join(str(snippet).split())
+            if not text:
+                continue
+            words = set(re.findall(r"\w+", text.lower()))
+            match = next((i for i, other in enumerate(kept_words) if self._similar(words, other)), None)
+            if match is None:
+                kept.append(text)
+                kept_words.append(words)
+            elif words > kept_words[match]:
+                # A bare line like "Price" must not crowd out the full result containing it
+                kept[match] = text
+                kept_words[match] = words
+        return kept
+
+    @staticmethod
+    def _similar(words, other):
+        if not words or not other:
+            return words == other
+        return words <= other or other <= words or len(words & other) / len(words | other) >= 0.8
+
+    @staticmethod
+    def _rank(snippets, query):
+        terms = {word for word in re.findall(r"\w+", query.lower()) if len(word) > 2}
+        if not terms:
+            return snippets
+        scores = [len(terms & set(re.findall(r"\w+", snippet.lower()))) for snippet in snippets]
+        order = sorted(range(len(snippets)), key=lambda i: (-scores[i], i))
+        return [snippets[i] for i in order]
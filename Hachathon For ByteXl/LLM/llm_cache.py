@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class LLMCache:
+    """Chat responses keyed by model, messages and options, in an in-memory LRU backed by SQLite"""
+
+    def __init__(self, path=None, ttl=24 * 3600, max_memory_entries=512, max_db_entries=20000):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_db_entries = max_db_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                             "key TEXT PRIMARY KEY, model TEXT, response TEXT, created_at REAL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model, messages, options=None, format=None):
+        payload = {"model": model, "messages": messages, "options": options or {}}
+        if format:
+            payload["format"] = format
+        payload = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self._remember(key, row[0], row[1])
+                    self.stats["db_hits"] += 1
+                    return row[0]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, model, response):
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            self.stats["stores"] += 1
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO responses (key, model, response, created_at) "
+                                 "VALUES (?, ?, ?, ?)", (key, model, response, now))
+                if self.stats["stores"] % 100 == 0:
+                    self._trim_db(now)
+                self._db.commit()
+
+    def discard(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+
+    def get_stats(self):
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["db_hits"]
+            lookups = hits + self.stats["misses"]
+            return {**self.stats,
+                    "memory_entries": len(self._memory),
+                    "hit_rate": hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def _remember(self, key, response, created_at):
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _trim_db(self, now):
+        cursor = self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        evicted = cursor.rowcount
+        cursor = self._db.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY created_at DESC "
+            "LIMIT -1 OFFSET ?)", (self.max_db_entries,))
+        evicted += cursor.rowcount
+        self.stats["evictions"] += max(0, evicted)
@@ -1,16 +1,180 @@
+import asyncio
+import threading
+import time
 import ollama
+from LLM import context_builder
+from LLM import model_router
+from LLM import task_actions
+from deadline import DeadlineExceeded
+PARSE_TASK_PROMPT = "You are a web automation assistant. Break down user requests into browser actions. Return JSON format with actions: navigate_to, click_element, type_text, extract_text"
 class LLMHandler:
-    def __init__(self, model="qwen2.5:0.5b"):
+    def __init__(self, model="qwen2.5:0.5b", cache=None, host=None, keep_alive=-1, router=None):
         self.model = model     
-    def generate_response(self, messages):
-        response = ollama.chat(
-            model=self.model,
-            messages=messages
-        )
-        return response['message']['content']        
-    def parse_task(self, user_input):
+        self.cache = cache
+        self.router = router
+        # One client reuses its HTTP connections; keep_alive stops Ollama unloading the model when idle
+        self.client = ollama.Client(host=host)
+        self.keep_alive = keep_alive
+        self.structured_stats = {"calls": 0, "retries": 0, "failures": 0}
+        self._stats_lock = threading.Lock()
+    def warm_up(self):
+        """Load the model, and the models interactive call sites are routed to, ahead of the first request"""
+        try:
+            start = time.time()
+            self.client.generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+            models = [self.model]
+            if self.router is not None:
+                self.router.refresh_available(self.client)
+                for call_site in model_router.INTERACTIVE_CALL_SITES:
+                    model = self.router.preferred(call_site)
+                    if model not in models:
+                        self.client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+                        models.append(model)
+            return {"status": "success", "model": self.model, "models": models, "load_time": time.time() - start}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    def preload(self, call_site=None, model=None, deadline=None):
+        """Make sure the model a call site will use is loaded; returns at once if it already is"""
+        if deadline is not None:
+            deadline.check("model preload")
+        if not model:
+            model = self.router.preferred(call_site) if self.router is not None and call_site else self.model
+        self.client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+        return model
+    def select_model(self, call_site=None, model=None):
+        if model:
+            return model
+        if self.router is not None and call_site:
+            return self.router.choose(call_site)
+        return self.model
+    def generate_response(self, messages, options=None, format=None, model=None, call_site=None, deadline=None,
+                          check_cache=True):
+        """check_cache=False skips the lookup (not the store) when the caller has already missed"""
+        model = self.select_model(call_site, model)
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(model, messages, options, format)
+            cached = self.cache.get(key) if check_cache else None
+            if cached is not None:
+                return cached
+        start = time.time()
+        if deadline is not None and deadline.remaining() is not None:
+            response = self._chat_until(deadline, model=model, messages=messages, options=options, format=format)
+        else:
+            response = self.client.chat(
+                model=model,
+                messages=messages,
+                options=options,
+                format=format,
+                keep_alive=self.keep_alive
+            )
+        if self.router is not None:
+            self.router.record(model, time.time() - start)
+        content = response['message']['content']
+        if response.get('prompt_eval_count'):
+            context_builder.record_prompt(model, messages, response['prompt_eval_count'])
+        if self.cache is not None:
+            self.cache.put(key, model, content)
+        return content        
+    def _chat_until(self, deadline, **kwargs):
+        """Chat call that gives up, and makes Ollama stop generating, once the deadline passes"""
+        deadline.check("LLM request")
+        stream = self.client.chat(keep_alive=self.keep_alive, stream=True, **kwargs)
+        parts = []
+        try:
+            for chunk in stream:
+                if deadline.expired():
+                    raise DeadlineExceeded("LLM generation exceeded the deadline")
+                parts.append(chunk['message']['content'])
+                if chunk.get('done'):
+                    return {'message': {'content': "".join(parts)},
+                            'prompt_eval_count': chunk.get('prompt_eval_count')}
+        finally:
+            # Closing the stream drops the HTTP connection, which cancels the generation
+            stream.close()
+        return {'message': {'content': "".join(parts)}}
+    def stream_response(self, messages, options=None, model=None, call_site=None, deadline=None, check_cache=True):
+        """Yield the reply token by token; a cached reply is yielded in one piece"""
+        model = self.select_model(call_site, model)
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(model, messages, options)
+            cached = self.cache.get(key) if check_cache else None
+            if cached is not None:
+                yield cached
+                return
+        tokens = []
+        start = time.time()
+        stream = self.client.chat(model=model, messages=messages, options=options,
+                                  keep_alive=self.keep_alive, stream=True)
+        try:
+            for chunk in stream:
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded("LLM stream exceeded the deadline")
+                if chunk.get('done') and chunk.get('prompt_eval_count'):
+                    context_builder.record_prompt(model, messages, chunk['prompt_eval_count'])
+                token = chunk['message']['content']
+                if token:
+                    tokens.append(token)
+                    yield token
+        finally:
+            stream.close()
+        # Only complete replies are cached or timed; a consumer that stops early skips this
+        if self.router is not None:
+            self.router.record(model, time.time() - start)
+        if self.cache is not None:
+            self.cache.put(key, model, "".join(tokens))
+    def embed(self, text, model):
+        response = self.client.embed(model=model, input=text, keep_alive=self.keep_alive)
+        return response['embeddings'][0]
+    async def generate_response_async(self, messages, options=None, format=None, model=None, call_site=None,
+                                      deadline=None):
+        return await asyncio.to_thread(self.generate_response, messages, options, format, model, call_site,
+                                       deadline)
+    def parse_task(self, user_input, structured=False):
+        if structured:
+            return self.parse_task_structured(user_input)
         messages = [
-            {"role": "system", "content": "You are a web automation assistant. Break down user requests into browser actions. Return JSON format with actions: navigate_to, click_element, type_text, extract_text"},
+            {"role": "system", "content": PARSE_TASK_PROMPT},
             {"role": "user", "content": f"Parse this task: {user_input}"}
         ]
-        return self.generate_response(messages)
+        return self.generate_response(messages, call_site="parse_task")
+    def parse_task_structured(self, user_input, max_retries=2):
+        """Schema-constrained parse_task returning typed actions; re-prompts only when validation fails"""
+        messages = [
+            {"role": "system", "content": PARSE_TASK_PROMPT},
+            {"role": "user", "content": f"Parse this task: {user_input}"}
+        ]
+        options = {"temperature": 0}
+        model = self.select_model("parse_task")
+        error = None
+        for attempt in range(max_retries + 1):
+            raw = None
+            try:
+                raw = self.generate_response(messages, options, format=task_actions.ACTION_SCHEMA, model=model)
+                actions = task_actions.parse_actions(raw)
+            except Exception as e:
+                error = str(e)
+                if raw is None:
+                    continue
+                if self.cache is not None:
+                    # Never replay a rejected reply from the cache
+                    self.cache.discard(self.cache.make_key(model, messages, options, task_actions.ACTION_SCHEMA))
+                messages = messages + [
+                    {"role": "assistant", "content": raw},
+                    {"role": "user", "content": f"That reply was invalid: {error}. Return corrected JSON only."}
+                ]
+                continue
+            self._record_structured(attempt, failed=False)
+            return {"status": "success", "actions": actions, "retries": attempt}
+        self._record_structured(max_retries, failed=True)
+        return {"status": "error", "message": f"Invalid task plan: {error}", "retries": max_retries}
+    def get_structured_stats(self):
+        with self._stats_lock:
+            return dict(self.structured_stats)
+    def _record_structured(self, retries, failed):
+        with self._stats_lock:
+            self.structured_stats["calls"] += 1
+            self.structured_stats["retries"] += retries
+            if failed:
+                self.structured_stats["failures"] += 1
@@ -0,0 +1,246 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+_current_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+_STREAM_END = object()
+
+class _Request:
+    def __init__(self, fn, args, kwargs, priority, deadline):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued_at = time.time()
+        self.future = Future()
+
+class LLMScheduler:
+    """Bounded-concurrency front for LLMHandler with interactive and batch priorities"""
+
+    def __init__(self, handler, max_concurrency=1, max_batch_concurrency=None, default_timeout=None):
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.max_batch_concurrency = max_batch_concurrency or max(1, max_concurrency - 1)
+        self.default_timeout = default_timeout
+        self._queues = {INTERACTIVE: deque(), BATCH: deque()}
+        self._running = {INTERACTIVE: 0, BATCH: 0}
+        self._waits = {INTERACTIVE: deque(maxlen=500), BATCH: deque(maxlen=500)}
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "expired": 0, "cancelled": 0}
+        for _ in range(max_concurrency):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def __getattr__(self, name):
+        return getattr(self.handler, name)
+
+    @contextmanager
+    def priority(self, level):
+        """Run LLM calls made inside the block (on this thread or task) at the given priority"""
+        token = _current_priority.set(level)
+        try:
+            yield
+        finally:
+            _current_priority.reset(token)
+
+    def submit(self, fn, *args, priority=None, timeout=None, **kwargs):
+        priority = priority or _current_priority.get()
+        timeout = self.default_timeout if timeout is None else timeout
+        deadline = None if not timeout else time.time() + timeout
+        request = _Request(fn, args, kwargs, priority, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("LLM scheduler is closed")
+            self._queues[priority].append(request)
+            self.stats["submitted"] += 1
+            self._cond.notify()
+        return request.future
+
+    def generate_response(self, messages, options=None, priority=None, timeout=None, format=None,
+                          call_site=None, deadline=None):
+        timeout = self._deadline_timeout(timeout, deadline)
+        model = self._route(call_site, timeout)
+        cached = self._cached(model, messages, options, format)
+        if cached is not None:
+            return cached
+        # The miss above is already counted; the handler only stores the reply
+        future = self.submit(self.handler.generate_response, messages, options, format, model,
+                             priority=priority, timeout=timeout, deadline=deadline, check_cache=False)
+        return self._result(future, timeout)
+
+    async def generate_response_async(self, messages, options=None, priority=None, timeout=None, format=None,
+                                      call_site=None, deadline=None):
+        # to_thread copies the context, so the caller's priority carries over
+        return await asyncio.to_thread(self.generate_response, messages, options, priority, timeout, format,
+                                       call_site, deadline)
+
+    def parse_task(self, user_input, structured=False, priority=None, timeout=None, deadline=None):
+        timeout = self._deadline_timeout(timeout, deadline)
+        future = self.submit(self.handler.parse_task, user_input, structured,
+                             priority=priority, timeout=timeout)
+        return self._result(future, timeout)
+
+    def parse_task_structured(self, user_input, priority=None, timeout=None, deadline=None):
+        return self.parse_task(user_input, True, priority, timeout, deadline)
+
+    def preload(self, call_site=None, priority=None, timeout=None, deadline=None):
+        """Load the model the call site would be routed to now, in a worker slot like any model call"""
+        timeout = self._deadline_timeout(timeout, deadline)
+        model = self._route(call_site, timeout, record=False)
+        future = self.submit(self.handler.preload, call_site, model, priority=priority, timeout=timeout)
+        return self._result(future, timeout)
+
+    def warm_up(self):
+        future = self.submit(self.handler.warm_up)
+        return future.result()
+
+    def stream_response(self, messages, options=None, priority=None, timeout=None, call_site=None,
+                        deadline=None):
+        """Yield tokens while holding one worker slot for the whole stream"""
+        tokens = queue.Queue()
+        stop = threading.Event()
+        timeout = self._deadline_timeout(timeout, deadline)
+        model = self._route(call_site, timeout)
+        cached = self._cached(model, messages, options)
+        if cached is not None:
+            yield cached
+            return
+
+        def produce():
+            stream = self.handler.stream_response(messages, options, model=model, check_cache=False)
+            try:
+                for token in stream:
+                    if stop.is_set() or (expires_at is not None and time.time() > expires_at):
+                        break
+                    tokens.put(token)
+            finally:
+                # Closes the Ollama connection so an abandoned stream stops generating
+                stream.close()
+                tokens.put(_STREAM_END)
+
+        timeout = self.default_timeout if timeout is None else timeout
+        expires_at = None if not timeout else time.time() + timeout
+        future = self.submit(produce, priority=priority, timeout=timeout)
+        try:
+            while True:
+                remaining = None if expires_at is None else max(0.0, expires_at - time.time())
+                try:
+                    token = tokens.get(timeout=remaining)
+                except queue.Empty:
+                    raise TimeoutError("LLM stream exceeded its deadline")
+                if token is _STREAM_END:
+                    break
+                yield token
+            future.result()
+        finally:
+            stop.set()
+            future.cancel()
+
+    def get_stats(self):
+        with self._cond:
+            classes = {}
+            for priority in (INTERACTIVE, BATCH):
+                waits = sorted(self._waits[priority])
+                classes[priority] = {
+                    "queue_depth": len(self._queues[priority]),
+                    "running": self._running[priority],
+                    "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                    "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "max_wait": waits[-1] if waits else 0.0,
+                }
+            return {**self.stats, **classes}
+
+    def queue_depth(self):
+        with self._cond:
+            return len(self._queues[INTERACTIVE]) + len(self._queues[BATCH])
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _deadline_timeout(self, timeout, deadline):
+        # A task deadline caps the per-request timeout; an expired one fails before queueing
+        if deadline is None:
+            return timeout
+        deadline.check("LLM request")
+        return deadline.bound(self.default_timeout if timeout is None else timeout)
+
+    def _route(self, call_site, timeout, record=True):
+        # Routing happens here rather than in the handler because only the scheduler sees the queue
+        router = getattr(self.handler, "router", None)
+        if router is None or not call_site:
+            return None
+        timeout = self.default_timeout if timeout is None else timeout
+        return router.choose(call_site, queue_depth=self.queue_depth(), time_left=timeout or None, record=record)
+
+    def _cached(self, model, messages, options, format=None):
+        cache = getattr(self.handler, "cache", None)
+        if cache is None:
+            return None
+        return cache.get(cache.make_key(model or self.handler.model, messages, options, format))
+
+    def _result(self, future, timeout):
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            return future.result(timeout or None)
+        except FutureTimeoutError:
+            # Still queued: cancel so it never reaches the model
+            if future.cancel():
+                with self._cond:
+                    self.stats["cancelled"] += 1
+            raise TimeoutError("LLM request exceeded its deadline")
+
+    def _next_request(self):
+        # Called with self._cond held
+        if self._queues[INTERACTIVE]:
+            return self._queues[INTERACTIVE].popleft()
+        if self._queues[BATCH] and self._running[BATCH] < self.max_batch_concurrency:
+            return self._queues[BATCH].popleft()
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                request = self._next_request()
+                while request is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    request = self._next_request()
+                self._running[request.priority] += 1
+                self._waits[request.priority].append(time.time() - request.enqueued_at)
+            try:
+                self._run(request)
+            finally:
+                with self._cond:
+                    self._running[request.priority] -= 1
+                    self._cond.notify()
+
+    def _run(self, request):
+        if not request.future.set_running_or_notify_cancel():
+            return
+        if request.deadline is not None and time.time() > request.deadline:
+            with self._cond:
+                self.stats["expired"] += 1
+            request.future.set_exception(TimeoutError("LLM request expired in the queue"))
+            return
+        try:
+            result = request.fn(*request.args, **request.kwargs)
+        except Exception as e:
+            with self._cond:
+                self.stats["failed"] += 1
+            request.future.set_exception(e)
+            return
+        with self._cond:
+            self.stats["completed"] += 1
+        request.future.set_result(result)
@@ -0,0 +1,104 @@
+import threading
+from collections import Counter, defaultdict, deque
+
+# Per call site, models from preferred (largest) to fastest fallback
+DEFAULT_ROUTES = {
+    "classify": ["qwen2.5:0.5b"],
+    "parse_task": ["qwen2.5:0.5b"],
+    "rewrite": ["qwen2.5:0.5b"],
+    "answer": ["qwen2.5:1.5b", "qwen2.5:0.5b"],
+    "summary": ["qwen2.5:1.5b", "qwen2.5:0.5b"],
+    "report": ["qwen2.5:3b", "qwen2.5:1.5b", "qwen2.5:0.5b"],
+}
+# Call sites a user waits on; warm-up loads their preferred models
+INTERACTIVE_CALL_SITES = ("summary", "answer")
+
+def _percentile(values, fraction):
+    return values[int(fraction * (len(values) - 1))] if values else 0.0
+
+class ModelRouter:
+    """Picks a model per call site, stepping down under queue or deadline pressure"""
+
+    def __init__(self, default_model, routes=None, max_queue_depth=2, min_samples=5, window=500):
+        self.default_model = default_model
+        self.routes = dict(DEFAULT_ROUTES if routes is None else routes)
+        self.max_queue_depth = max_queue_depth
+        self.min_samples = min_samples
+        self.available = None
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._decisions = defaultdict(Counter)
+        self._downgrades = Counter()
+        self._lock = threading.Lock()
+
+    def refresh_available(self, client):
+        """Restrict routing to the models pulled into the Ollama server"""
+        try:
+            listing = client.list()
+        except Exception as e:
+            print(f"Could not list Ollama models, routing disabled: {e}")
+            return None
+        names = set()
+        for entry in listing["models"]:
+            name = getattr(entry, "model", None) or entry.get("name")
+            if name:
+                names.add(name)
+        with self._lock:
+            self.available = names
+        return names
+
+    def choose(self, call_site, queue_depth=0, time_left=None, record=True):
+        """Pick a model for a call; record=False previews the choice, e.g. for a preload"""
+        candidates = self._candidates(call_site)
+        index = 0
+        reason = None
+        if queue_depth >= self.max_queue_depth and len(candidates) > 1:
+            index, reason = 1, "queue"
+        if time_left is not None:
+            while index < len(candidates) - 1 and self._p95(candidates[index]) > time_left:
+                index, reason = index + 1, "deadline"
+        model = candidates[index]
+        if not record:
+            return model
+        with self._lock:
+            self._decisions[call_site][model] += 1
+            if reason:
+                self._downgrades[reason] += 1
+        return model
+
+    def preferred(self, call_site):
+        """The model choose() would pick with no pressure, without counting a decision"""
+        return self._candidates(call_site)[0]
+
+    def record(self, model, latency):
+        with self._lock:
+            self._latencies[model].append(latency)
+
+    def get_stats(self):
+        with self._lock:
+            models = {}
+            for model, samples in self._latencies.items():
+                ordered = sorted(samples)
+                models[model] = {"count": len(ordered),
+                                 "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+                                 "p50": _percentile(ordered, 0.5),
+                                 "p95": _percentile(ordered, 0.95),
+                                 "p99": _percentile(ordered, 0.99)}
+            return {"models": models,
+                    "decisions": {site: dict(counts) for site, counts in self._decisions.items()},
+                    "downgrades": dict(self._downgrades)}
+
+    def _candidates(self, call_site):
+        with self._lock:
+            available = self.available
+        if available is None:
+            return [self.default_model]
+        route = [model for model in self.routes.get(call_site, []) if model in available]
+        return route or [self.default_model]
+
+    def _p95(self, model):
+        with self._lock:
+            samples = sorted(self._latencies.get(model, ()))
+        # Too little data to judge: assume it fits
+        if len(samples) < self.min_samples:
+            return 0.0
+        return _percentile(samples, 0.95)
@@ -0,0 +1,77 @@
+import json
+from dataclasses import dataclass, asdict
+
+@dataclass
+class NavigateTo:
+    url: str
+    action: str = "navigate_to"
+
+@dataclass
+class ClickElement:
+    selector: str
+    action: str = "click_element"
+
+@dataclass
+class TypeText:
+    selector: str
+    text: str
+    action: str = "type_text"
+
+@dataclass
+class ExtractText:
+    selector: str = ""
+    action: str = "extract_text"
+
+ACTION_TYPES = {
+    "navigate_to": (NavigateTo, ["url"]),
+    "click_element": (ClickElement, ["selector"]),
+    "type_text": (TypeText, ["selector", "text"]),
+    "extract_text": (ExtractText, []),
+}
+
+# Passed to Ollama as `format` so decoding is constrained to this shape
+ACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "actions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "action": {"type": "string", "enum": list(ACTION_TYPES)},
+                    "url": {"type": "string"},
+                    "selector": {"type": "string"},
+                    "text": {"type": "string"},
+                },
+                "required": ["action"],
+            },
+        },
+    },
+    "required": ["actions"],
+}
+
+def parse_actions(raw):
+    """Validate a model reply against ACTION_SCHEMA; raises ValueError describing the first problem"""
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"reply is not valid JSON: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("actions"), list):
+        raise ValueError("reply must be an object with an 'actions' list")
+    actions = []
+    for index, item in enumerate(data["actions"]):
+        if not isinstance(item, dict) or item.get("action") not in ACTION_TYPES:
+            raise ValueError(f"action {index} has an unknown type; expected one of {list(ACTION_TYPES)}")
+        cls, required = ACTION_TYPES[item["action"]]
+        missing = [name for name in required if not isinstance(item.get(name), str) or not item[name].strip()]
+        if missing:
+            raise ValueError(f"action {index} ({item['action']}) is missing {', '.join(missing)}")
+        fields = {name: item[name] for name in ("url", "selector", "text")
+                  if name in cls.__dataclass_fields__ and isinstance(item.get(name), str)}
+        actions.append(cls(**fields))
+    if not actions:
+        raise ValueError("reply contains no actions")
+    return actions
+
+def actions_to_dicts(actions):
+    return [asdict(action) for action in actions]
@@ -1,18 +1,21 @@
 import time
 import json
+import threading
 
 class AgentMemory:
     def __init__(self):
         self.task_history = []
         self.context = {}
+        self._lock = threading.Lock()
         
     def add_task(self, task, result):
-        self.task_history.append({
-            "task": task,
-            "result": result,
-            "timestamp": time.time(),
-            "status": result.get("status", "unknown")
-        })
+        with self._lock:
+            self.task_history.append({
+                "task": task,
+                "result": result,
+                "timestamp": time.time(),
+                "status": result.get("status", "unknown")
+            })
         
     def get_recent_tasks(self, count=5):
         return self.task_history[-count:]
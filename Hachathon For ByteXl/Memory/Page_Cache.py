@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "yclid", "ref", "ref_src"}
+
+def normalize_url(url):
+    """Canonical cache key: lowercase host, default port and fragment dropped, sorted query"""
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.startswith("utm_") and key not in TRACKING_PARAMS)
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+class PageCache:
+    """Byte-bounded LRU of page snapshots with TTL freshness and HTTP validators"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=300):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "revalidated": 0,
+                      "stores": 0, "evictions": 0}
+
+    def lookup(self, url):
+        """Return (entry, state) where state is "fresh", "stale" or None for a miss"""
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if time.time() - entry["fetched_at"] < self.ttl:
+                self.stats["hits"] += 1
+                return dict(entry), "fresh"
+            self.stats["stale_hits"] += 1
+            return dict(entry), "stale"
+
+    def store(self, url, title="", text="", html="", etag=None, last_modified=None):
+        key = normalize_url(url)
+        entry = {"url": key, "title": title, "text": text, "html": html,
+                 "etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+        entry["size"] = len(title.encode()) + len(text.encode()) + len(html.encode())
+        if entry["size"] > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old["size"]
+            self._entries[key] = entry
+            self._bytes += entry["size"]
+            self.stats["stores"] += 1
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted["size"]
+                self.stats["evictions"] += 1
+
+    def mark_revalidated(self, url):
+        """The origin answered 304 Not Modified: the snapshot is fresh again"""
+        with self._lock:
+            entry = self._entries.get(normalize_url(url))
+            if entry is not None:
+                entry["fetched_at"] = time.time()
+                self.stats["revalidated"] += 1
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+            return {**self.stats,
+                    "entries": len(self._entries),
+                    "bytes": self._bytes,
+                    "hit_rate": (self.stats["hits"] + self.stats["revalidated"]) / lookups if lookups else 0.0}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
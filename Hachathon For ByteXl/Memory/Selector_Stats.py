@@ -0,0 +1,85 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+class SelectorStats:
+    """Per-domain record of which result selectors worked, used to try the best first"""
+
+    def __init__(self, path=None, save_interval=30, decay=0.95):
+        self.path = path
+        self.decay = decay
+        self.save_interval = save_interval
+        self._stats = {}
+        self._dirty = False
+        self._last_save = time.time()
+        self._lock = threading.Lock()
+        self._load()
+        if path:
+            atexit.register(self.save)
+
+    def rank(self, domain, page_type, selectors):
+        """Return selectors ordered by historical success, ties keep the given order"""
+        with self._lock:
+            counts = self._stats.get(domain, {}).get(page_type, {})
+            scores = {selector: self._score(counts.get(selector)) for selector in selectors}
+        return sorted(selectors, key=lambda selector: -scores[selector])
+
+    def record(self, domain, page_type, selector, hit):
+        with self._lock:
+            counts = self._stats.setdefault(domain, {}).setdefault(page_type, {})
+            entry = counts.setdefault(selector, {"hits": 0, "misses": 0})
+            entry["hits"] *= self.decay
+            entry["misses"] *= self.decay
+            entry["hits" if hit else "misses"] += 1
+            self._dirty = True
+            due = time.time() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+
+    def clear(self):
+        """Forget every observation, e.g. between benchmark runs"""
+        with self._lock:
+            self._stats = {}
+            self._dirty = True
+
+    def get_stats(self, domain=None):
+        with self._lock:
+            if domain is None:
+                return json.loads(json.dumps(self._stats))
+            return json.loads(json.dumps(self._stats.get(domain, {})))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._stats)
+            self._dirty = False
+            self._last_save = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save selector stats: {e}")
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._stats = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable selector stats: {e}")
+
+    @staticmethod
+    def _score(entry):
+        # Laplace smoothing puts unseen selectors at 0.5, between proven and failing ones
+        if not entry:
+            return 0.5
+        return (entry["hits"] + 1) / (entry["hits"] + entry["misses"] + 2)
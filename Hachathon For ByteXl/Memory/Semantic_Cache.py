@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    import chromadb
+except ImportError:
+    chromadb = None
+
+# Words users swap freely in otherwise identical requests
+SYNONYMS = {
+    "top": "best", "greatest": "best", "below": "under", "less than": "under", "cheaper than": "under",
+    "dollars": "usd", "dollar": "usd", "bucks": "usd", "rs": "inr", "rupees": "inr",
+    "laptops": "laptop", "phones": "phone", "please": "", "can you": "", "show me": "find",
+}
+# Tasks report "completed"; tool-level results use "success"
+STORED_STATUSES = ("success", "completed")
+_DOMAIN_PATTERN = re.compile(r"\b(?:[a-z0-9-]+\.)+[a-z]{2,}\b")
+_NUMBER_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SYNONYM_PATTERN = re.compile(r"\b(" + "|".join(sorted(map(re.escape, SYNONYMS), key=len, reverse=True)) + r")\b")
+
+def _chroma_model_present():
+    """Chroma downloads its default embedding model on first use; report whether it is already on disk"""
+    try:
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+    except ImportError:
+        return False
+    folder = ONNXMiniLM_L6_V2.DOWNLOAD_PATH
+    return (os.path.exists(os.path.join(folder, ONNXMiniLM_L6_V2.EXTRACTED_FOLDER_NAME, "model.onnx"))
+            or os.path.exists(os.path.join(folder, ONNXMiniLM_L6_V2.ARCHIVE_FILENAME)))
+
+def normalize_query(text):
+    """Lowercase, spell out currency symbols and fold common synonyms so paraphrases embed alike"""
+    text = text.lower()
+    text = re.sub(r"\$\s*(\d[\d,]*)", r"\1 usd", text)
+    text = re.sub(r"(\d),(?=\d{3}\b)", r"\1", text)
+    text = re.sub(r"(\d+)k\b", r"\g<1>000", text)
+    text = _SYNONYM_PATTERN.sub(lambda match: SYNONYMS[match.group(1)], text)
+    text = re.sub(r"[^\w\s.]", " ", text)
+    return " ".join(text.split())
+
+def query_constraints(normalized):
+    """Domains and numbers in a normalized query; one differing token can change the answer entirely"""
+    domains = set(_DOMAIN_PATTERN.findall(normalized))
+    numbers = set(_NUMBER_PATTERN.findall(_DOMAIN_PATTERN.sub(" ", normalized)))
+    return domains, numbers
+
+class SemanticCache:
+    """Recent results for requests that mean the same as an earlier one"""
+
+    def __init__(self, path, embed_fn=None, embed_model="default", threshold=0.92, max_age=3600, candidates=3):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_age = max_age
+        self.candidates = candidates
+        self.collection = None
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+        self._lock = threading.Lock()
+        if chromadb is None:
+            print("chromadb is not installed; semantic result cache disabled")
+            return
+        if embed_fn is None and not _chroma_model_present():
+            # Downloading it would make every store fail offline
+            print("No local embedding model; semantic result cache disabled")
+            return
+        os.makedirs(path, exist_ok=True)
+        client = chromadb.PersistentClient(path=path)
+        # One collection per embedding model: vectors from different models are not comparable
+        name = "results_" + re.sub(r"[^A-Za-z0-9_-]", "_", embed_model)
+        self.collection = client.get_or_create_collection(name, metadata={"hnsw:space": "cosine"})
+
+    def lookup(self, query):
+        """Return (result, similarity) for a fresh near-duplicate query, or (None, best_similarity)"""
+        if self.collection is None:
+            return None, None
+        normalized = normalize_query(query)
+        try:
+            kwargs = self._query_input(normalized)
+            with self._lock:
+                if self.collection.count() == 0:
+                    self.stats["misses"] += 1
+                    return None, None
+                found = self.collection.query(n_results=self.candidates,
+                                              where={"created_at": {"$gte": time.time() - self.max_age}},
+                                              include=["metadatas", "distances"], **kwargs)
+        except Exception as e:
+            self._failed("lookup", e)
+            return None, None
+        best = None
+        constraints = query_constraints(normalized)
+        for distance, metadata in zip(found["distances"][0], found["metadatas"][0]):
+            similarity = 1.0 - distance
+            best = similarity if best is None else max(best, similarity)
+            print(f"Semantic cache: similarity {similarity:.3f} between '{normalized}' and '{metadata['query']}'")
+            if similarity >= self.threshold and query_constraints(metadata["query"]) == constraints:
+                self._count("hits")
+                return json.loads(metadata["result"]), similarity
+        self._count("misses")
+        return None, best
+
+    def store(self, query, result):
+        if self.collection is None or result.get("status") not in STORED_STATUSES:
+            return
+        # Cut-short and placeholder results must not be replayed for an hour
+        if result.get("cached") or result.get("partial") or result.get("fallback"):
+            return
+        normalized = normalize_query(query)
+        try:
+            kwargs = self._query_input(normalized)
+            entry = {"ids": [hashlib.sha1(normalized.encode("utf-8")).hexdigest()],
+                     "metadatas": [{"query": normalized, "created_at": time.time(),
+                                    "result": json.dumps(result, default=str)}]}
+            if "query_embeddings" in kwargs:
+                entry["embeddings"] = kwargs["query_embeddings"]
+            else:
+                entry["documents"] = kwargs["query_texts"]
+            with self._lock:
+                self.collection.delete(where={"created_at": {"$lt": time.time() - self.max_age}})
+                self.collection.upsert(**entry)
+            self._count("stores")
+        except Exception as e:
+            self._failed("store", e)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {**self.stats,
+                    "enabled": self.collection is not None,
+                    "hit_rate": self.stats["hits"] / lookups if lookups else 0.0}
+
+    def _query_input(self, normalized):
+        if self.embed_fn is None:
+            return {"query_texts": [normalized]}
+        return {"query_embeddings": [self.embed_fn(normalized)]}
+
+    def _failed(self, action, e):
+        self._count("errors")
+        print(f"Semantic cache {action} failed: {e}")
+        if getattr(e, "status_code", None) == 404:
+            # The embed model is not pulled; every later call would fail the same way
+            print("Embedding model not found; semantic result cache disabled")
+            self.collection = None
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
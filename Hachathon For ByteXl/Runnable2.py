@@ -1647,6 +1647,7 @@ if (process_button or st.session_state.get('auto_process', False)) and user_inpu
     loading_container = st.empty()
     progress_container = st.empty()
     status_container = st.empty()
+    live_output_container = st.empty()
     
     stages = [
         ("Initializing AI Agent", "Preparing advanced AI systems for your request", 0),
@@ -1680,11 +1681,16 @@ if (process_button or st.session_state.get('auto_process', False)) and user_inpu
                 <i class="fas fa-cog fa-spin"></i> Processing... {progress}%
             </div>
             """, unsafe_allow_html=True)
-        
-        time.sleep(0.5)
+    
+    streamed_tokens = []
+    
+    def render_token(token):
+        # Show the AI summary while it is still being generated
+        streamed_tokens.append(token)
+        live_output_container.markdown("".join(streamed_tokens) + " ▌")
     
     try:
-        result = agent.process_request(user_input)
+        result = agent.process_request(user_input, on_token=render_token)
         execution_time = time.time() - start_time
         
         st.session_state.metrics.last_execution_time = execution_time
@@ -1698,6 +1704,7 @@ if (process_button or st.session_state.get('auto_process', False)) and user_inpu
         loading_container.empty()
         progress_container.empty()
         status_container.empty()
+        live_output_container.empty()
         
         st.markdown('<div class="results-section">', unsafe_allow_html=True)
         st.markdown("## Execution Results")
@@ -1721,6 +1728,9 @@ if (process_button or st.session_state.get('auto_process', False)) and user_inpu
             </div>
             """, unsafe_allow_html=True)
             
+            if result.get('partial'):
+                st.warning("Time limit reached: showing the results gathered so far.")
+            
             st.markdown('<div class="result-card">', unsafe_allow_html=True)
             
             st.markdown(f"""
@@ -1831,6 +1841,7 @@ if (process_button or st.session_state.get('auto_process', False)) and user_inpu
         loading_container.empty()
         progress_container.empty()
         status_container.empty()
+        live_output_container.empty()
         
         st.markdown(f"""
         <div class="message-container">
@@ -0,0 +1,52 @@
+import asyncio
+from Tools import Browser_Tools
+
+class AsyncBrowserTools:
+    """Awaitable front end for BrowserTools"""
+
+    def __init__(self, browser_tools=None):
+        self.sync = browser_tools or Browser_Tools.BrowserTools()
+        self._lock = asyncio.Lock()
+
+    @property
+    def driver(self):
+        return self.sync.driver
+
+    async def _call(self, method, *args, **kwargs):
+        async with self._lock:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+    async def start_browser(self, headless=True, **kwargs):
+        return await self._call(self.sync.start_browser, headless, **kwargs)
+
+    async def navigate_to(self, url, wait_for=None, timeout=10, network_idle=False, deadline=None):
+        return await self._call(self.sync.navigate_to, url, wait_for=wait_for, timeout=timeout,
+                                network_idle=network_idle, deadline=deadline)
+
+    async def wait_for_page(self, selector=None, timeout=10, network_idle=False, stale_element=None,
+                            deadline=None):
+        return await self._call(self.sync.wait_for_page, selector=selector, timeout=timeout,
+                                network_idle=network_idle, stale_element=stale_element, deadline=deadline)
+
+    async def click_element(self, selector, deadline=None):
+        return await self._call(self.sync.click_element, selector, deadline=deadline)
+
+    async def type_text(self, selector, text, deadline=None):
+        return await self._call(self.sync.type_text, selector, text, deadline=deadline)
+
+    async def extract_text(self, selector=None, max_chars=None, deadline=None):
+        return await self._call(self.sync.extract_text, selector, max_chars=max_chars, deadline=deadline)
+
+    async def extract_matching_lines(self, keywords=(), scan_lines=10, max_lines=10, max_line_chars=300,
+                                     deadline=None):
+        return await self._call(self.sync.extract_matching_lines, keywords, scan_lines, max_lines, max_line_chars,
+                                deadline=deadline)
+
+    async def extract_elements(self, selectors, limit=5, first_match_only=False, deadline=None):
+        return await self._call(self.sync.extract_elements, selectors, limit, first_match_only, deadline=deadline)
+
+    async def get_page_title(self, deadline=None):
+        return await self._call(self.sync.get_page_title, deadline=deadline)
+
+    async def close_browser(self):
+        return await self._call(self.sync.close_browser)
@@ -0,0 +1,45 @@
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+                  "*encrypted-tbn*.gstatic.com*", "*/images/branding/*"]
+MEDIA_PATTERNS = ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav", "*.m4s"]
+FONT_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+TRACKER_PATTERNS = ["*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*",
+                    "*google-analytics.com*", "*googletagmanager.com*", "*adservice.google.*",
+                    "*facebook.net*", "*connect.facebook.com*", "*scorecardresearch.com*",
+                    "*amazon-adsystem.com*", "*criteo.com*", "*taboola.com*", "*outbrain.com*"]
+
+# url_patterns are pushed to Chrome at runtime through Network.setBlockedURLs;
+# content_settings become Chrome prefs and only apply to a freshly started browser
+BLOCKING_PROFILES = {
+    "none": {
+        "url_patterns": [],
+        "content_settings": {},
+    },
+    "no-media": {
+        "url_patterns": IMAGE_PATTERNS + MEDIA_PATTERNS,
+        "content_settings": {"images": 2},
+    },
+    "text-only": {
+        "url_patterns": IMAGE_PATTERNS + MEDIA_PATTERNS + FONT_PATTERNS + TRACKER_PATTERNS,
+        "content_settings": {"images": 2, "media_stream": 2, "plugins": 2,
+                             "notifications": 2, "geolocation": 2},
+    },
+}
+
+# Which profile each task type from WebAgent.classify_task runs with
+TASK_BLOCKING_PROFILES = {
+    "shopping": "no-media",
+    "navigation": "text-only",
+    "question": "text-only",
+    "search": "text-only",
+    "general": "no-media",
+}
+
+def get_profile(name):
+    if name not in BLOCKING_PROFILES:
+        raise ValueError(f"Unknown blocking profile: {name}")
+    return BLOCKING_PROFILES[name]
+
+def chrome_prefs(name):
+    """Chrome prefs that block resource types for the given profile"""
+    settings = get_profile(name)["content_settings"]
+    return {f"profile.managed_default_content_settings.{key}": value for key, value in settings.items()}
@@ -0,0 +1,282 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from Tools import Browser_Tools
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def _kill_tree(process):
+    """Kill chromedriver and the Chrome processes it started; without psutil only chromedriver"""
+    if psutil is not None:
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+    try:
+        process.kill()
+    except Exception:
+        pass
+
+class BrowserPool:
+    """Keeps warm Chrome instances and hands them out one task at a time"""
+
+    def __init__(self, size=2, max_pages=50, max_age=900, headless=True, browser_factory=None,
+                 blocking_profile="none", profile_manager=None, quit_timeout=10):
+        self.size = size
+        self.quit_timeout = quit_timeout
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.headless = headless
+        self.blocking_profile = blocking_profile
+        self.profile_manager = profile_manager
+        self.browser_factory = browser_factory or Browser_Tools.BrowserTools
+        self._free_slots = list(range(size))
+        self._idle = []
+        self._in_use = set()
+        self._starting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "start_failures": 0}
+        if profile_manager is not None:
+            profile_manager.cleanup(active_slots=range(size))
+        atexit.register(self.close)
+
+    def warm(self, count=None, block=False):
+        """Start browsers ahead of time so the first tasks skip the cold start"""
+        count = self.size if count is None else min(count, self.size)
+        threads = []
+        with self._cond:
+            if self._closed:
+                return
+            missing = count - (len(self._idle) + len(self._in_use) + self._starting)
+            for _ in range(min(max(0, missing), len(self._free_slots))):
+                slot = self._reserve_slot()
+                threads.append(threading.Thread(target=self._refill, args=(slot,), daemon=True))
+        for thread in threads:
+            thread.start()
+        if block:
+            for thread in threads:
+                thread.join()
+
+    def acquire(self, timeout=None):
+        """Check out a browser, starting a new one if the pool has room"""
+        deadline = None if timeout is None else time.time() + timeout
+        stale = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    browser = self._idle.pop()
+                    if self._needs_recycle(browser):
+                        stale = browser
+                        break
+                    self._in_use.add(browser)
+                    self.stats["reused"] += 1
+                    return browser
+                if self._free_slots:
+                    break
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No browser available in pool")
+                self._cond.wait(remaining)
+            if stale is not None:
+                # The replacement inherits the worn-out browser's slot
+                slot = stale.pool_slot
+                self._starting += 1
+            else:
+                slot = self._reserve_slot()
+        if stale is not None:
+            self._quit(stale)
+        browser = self._start_in_slot(slot)
+        with self._cond:
+            self._starting -= 1
+            self._in_use.add(browser)
+        return browser
+
+    def try_acquire_idle(self):
+        """Check out an idle browser without waiting or starting one; None when none is idle"""
+        with self._cond:
+            if self._closed:
+                return None
+            for browser in reversed(self._idle):
+                if not self._needs_recycle(browser):
+                    self._idle.remove(browser)
+                    self._in_use.add(browser)
+                    self.stats["reused"] += 1
+                    return browser
+        return None
+
+    def release(self, browser, reset=True):
+        """Return a browser to the pool, recycling it if worn out; reset=False skips clearing an unused one"""
+        # Persistent profiles keep cookies so consent flows are not repeated
+        clear_cookies = self.profile_manager is None
+        keep = (not self._needs_recycle(browser)
+                and (not reset or browser.reset_state(clear_cookies=clear_cookies).get("status") == "success"))
+        with self._cond:
+            self._in_use.discard(browser)
+            keep = keep and not self._closed
+            if keep:
+                self._idle.append(browser)
+                self._cond.notify()
+        if not keep:
+            self._retire(browser)
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        browser = self.acquire(timeout)
+        try:
+            yield browser
+        finally:
+            self.release(browser)
+
+    def snapshot(self):
+        """(browser, state) pairs for every running browser"""
+        with self._cond:
+            return ([(browser, "idle") for browser in self._idle]
+                    + [(browser, "in_use") for browser in self._in_use])
+
+    def check_idle(self, check):
+        """Run check(browser) on each idle browser, replacing those that fail"""
+        with self._cond:
+            candidates = list(self._idle)
+        for browser in candidates:
+            with self._cond:
+                if browser not in self._idle:
+                    continue
+                self._idle.remove(browser)
+                self._in_use.add(browser)
+            try:
+                healthy = check(browser)
+            except Exception:
+                healthy = False
+            if healthy:
+                with self._cond:
+                    self._in_use.discard(browser)
+                    if not self._closed:
+                        self._idle.append(browser)
+                        self._cond.notify()
+                        continue
+            else:
+                with self._cond:
+                    self._in_use.discard(browser)
+            self._retire(browser)
+
+    def mark_for_recycle(self, browser):
+        """Replace a checked-out browser once its current task releases it"""
+        browser.recycle_requested = True
+
+    def get_stats(self):
+        with self._cond:
+            return {**self.stats,
+                    "size": self.size,
+                    "idle": len(self._idle),
+                    "in_use": len(self._in_use),
+                    "starting": self._starting}
+
+    def close(self):
+        """Quit idle browsers; checked-out ones are closed when released"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for browser in idle:
+            browser.close_browser()
+
+    def _needs_recycle(self, browser):
+        return (browser.driver is None
+                or browser.recycle_requested
+                or browser.page_count >= self.max_pages
+                or browser.get_age() >= self.max_age)
+
+    def _retire(self, browser):
+        self._quit(browser)
+        self._free_slot(browser)
+        self._replace()
+
+    def _replace(self):
+        # Start a fresh browser in the background to stand in for a recycled one
+        with self._cond:
+            if self._closed or not self._free_slots:
+                return
+            slot = self._reserve_slot()
+        threading.Thread(target=self._refill, args=(slot,), daemon=True).start()
+
+    def _reserve_slot(self):
+        # Called with self._cond held
+        self._starting += 1
+        return self._free_slots.pop(0)
+
+    def _start_in_slot(self, slot):
+        # The slot is counted in self._starting; the caller moves the running
+        # browser into the idle or in-use set
+        try:
+            browser = self.browser_factory()
+            browser.pool_slot = slot
+            profile_args = self.profile_manager.browser_args(slot) if self.profile_manager else {}
+            result = browser.start_browser(headless=self.headless, blocking_profile=self.blocking_profile,
+                                           **profile_args)
+            if result.get("status") != "success":
+                raise RuntimeError(result.get("message", "Failed to start browser"))
+        except Exception:
+            with self._cond:
+                self._free_slots.append(slot)
+                self._starting -= 1
+                self.stats["start_failures"] += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats["created"] += 1
+        return browser
+
+    def _refill(self, slot):
+        try:
+            browser = self._start_in_slot(slot)
+        except Exception as e:
+            print(f"Browser pool could not start a browser: {e}")
+            return
+        with self._cond:
+            self._starting -= 1
+            if not self._closed:
+                self._idle.append(browser)
+                self._cond.notify()
+                return
+        browser.close_browser()
+
+    def _quit(self, browser):
+        # A hung chromedriver blocks quit() until Selenium's remote timeout, so quit
+        # from a helper thread and kill the driver process if it does not finish
+        process = getattr(getattr(browser.driver, "service", None), "process", None)
+        done = threading.Event()
+
+        def quit_browser():
+            try:
+                browser.close_browser()
+            except Exception:
+                pass
+            finally:
+                done.set()
+
+        threading.Thread(target=quit_browser, daemon=True).start()
+        if not done.wait(self.quit_timeout) and process is not None:
+            print(f"Browser did not quit within {self.quit_timeout}s; killing chromedriver and Chrome")
+            _kill_tree(process)
+        if self.profile_manager is not None:
+            self.profile_manager.cleanup_slot(browser.pool_slot)
+        with self._cond:
+            self.stats["recycled"] += 1
+
+    def _free_slot(self, browser):
+        with self._cond:
+            self._free_slots.append(browser.pool_slot)
+            browser.pool_slot = None
+            self._cond.notify()
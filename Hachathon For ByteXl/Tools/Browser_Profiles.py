@@ -0,0 +1,110 @@
+import os
+import shutil
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+def _try_lock(path):
+    """Open and exclusively lock path without blocking; None if another process holds it"""
+    handle = open(path, "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+class ProfileManager:
+    """Persistent Chrome profile and disk-cache directories, one per pool slot"""
+
+    def __init__(self, root, disk_cache_size=256 * 1024 * 1024, max_profile_bytes=1024 * 1024 * 1024,
+                 max_idle_days=7):
+        self.root = root
+        self.disk_cache_size = disk_cache_size
+        self.max_profile_bytes = max_profile_bytes
+        self.max_idle_days = max_idle_days
+        self._claims = {}
+        self._lock = threading.Lock()
+
+    def slot_dir(self, slot):
+        with self._lock:
+            if slot not in self._claims:
+                self._claims[slot] = self._claim()
+            return os.path.join(self.root, self._claims[slot][0])
+
+    def browser_args(self, slot):
+        """Keyword arguments for BrowserTools.start_browser"""
+        slot_dir = self.slot_dir(slot)
+        profile_dir = os.path.join(slot_dir, "profile")
+        cache_dir = os.path.join(slot_dir, "cache")
+        os.makedirs(profile_dir, exist_ok=True)
+        os.makedirs(cache_dir, exist_ok=True)
+        return {"user_data_dir": profile_dir,
+                "disk_cache_dir": cache_dir,
+                "disk_cache_size": self.disk_cache_size}
+
+    def cleanup_slot(self, slot):
+        """Trim a stopped slot: drop the cache or whole profile once it outgrows its budget"""
+        slot_dir = self.slot_dir(slot)
+        if not os.path.isdir(slot_dir):
+            return
+        cache_dir = os.path.join(slot_dir, "cache")
+        if self._dir_size(cache_dir) > self.disk_cache_size:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        if self._dir_size(slot_dir) > self.max_profile_bytes:
+            shutil.rmtree(slot_dir, ignore_errors=True)
+
+    def cleanup(self, active_slots=()):
+        """Remove slot directories that are unused and idle past max_idle_days"""
+        if not os.path.isdir(self.root):
+            return
+        cutoff = time.time() - self.max_idle_days * 86400
+        with self._lock:
+            active = {self._claims[slot][0] for slot in active_slots if slot in self._claims}
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not name.startswith("slot-") or name.endswith(".lock") or name in active:
+                continue
+            handle = _try_lock(path + ".lock")
+            if handle is None:
+                continue  # In use by another process
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+            finally:
+                handle.close()
+
+    def _claim(self):
+        # Called with self._lock held; the open lock handle is kept for the life of the process
+        os.makedirs(self.root, exist_ok=True)
+        taken = {name for name, _ in self._claims.values()}
+        index = 0
+        while True:
+            name = f"slot-{index}"
+            if name not in taken:
+                handle = _try_lock(os.path.join(self.root, name + ".lock"))
+                if handle is not None:
+                    return name, handle
+            index += 1
+
+    @staticmethod
+    def _dir_size(path):
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+        return total
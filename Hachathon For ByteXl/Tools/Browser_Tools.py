@@ -3,16 +3,115 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException
+from Tools.Page_Waits import wait_for_page
+from Tools import Driver_Resolver
+from Tools import Blocking_Profiles
 import time
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Collects text, link and geometry for every match in a single round trip
+BULK_EXTRACT_SCRIPT = """
+const [selectors, limit, firstMatchOnly] = arguments;
+const groups = [];
+for (const selector of selectors) {
+    let nodes;
+    try {
+        nodes = document.querySelectorAll(selector);
+    } catch (e) {
+        continue;
+    }
+    if (!nodes.length) {
+        continue;
+    }
+    const items = [];
+    for (const node of Array.prototype.slice.call(nodes, 0, limit)) {
+        const link = node.matches('a[href]') ? node : node.querySelector('a[href]');
+        const rect = node.getBoundingClientRect();
+        items.push({
+            text: (node.innerText || '').trim(),
+            href: link ? link.href : null,
+            rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+            visible: rect.width > 0 && rect.height > 0
+        });
+    }
+    groups.push({selector: selector, count: nodes.length, items: items});
+    if (firstMatchOnly) {
+        break;
+    }
+}
+return groups;
+"""
+
+# Truncation and line/keyword filtering happen in the page so only the
+# bounded result crosses the WebDriver wire
+PAGE_TEXT_SCRIPT = """
+const [selector, maxChars] = arguments;
+if (selector) {
+    const texts = [];
+    let used = 0;
+    for (const node of document.querySelectorAll(selector)) {
+        const text = (node.innerText || '').trim();
+        if (!text) {
+            continue;
+        }
+        texts.push(text.slice(0, maxChars - used));
+        used += text.length;
+        if (used >= maxChars) {
+            break;
+        }
+    }
+    return {title: document.title, texts: texts};
+}
+const body = document.body ? document.body.innerText || '' : '';
+return {title: document.title, texts: [body.slice(0, maxChars)]};
+"""
+MATCHING_LINES_SCRIPT = """
+const [scanLines, keywords, maxLines, maxLineChars] = arguments;
+const body = document.body ? document.body.innerText || '' : '';
+const matches = [];
+let start = 0;
+for (let scanned = 0; scanned < scanLines && start <= body.length; scanned++) {
+    let end = body.indexOf('\\n', start);
+    if (end === -1) {
+        end = body.length;
+    }
+    const line = body.slice(start, end).trim();
+    start = end + 1;
+    const lower = line.toLowerCase();
+    if (line && (!keywords.length || keywords.some(word => lower.includes(word)))) {
+        matches.push(line.slice(0, maxLineChars));
+        if (matches.length >= maxLines) {
+            break;
+        }
+    }
+}
+return matches;
+"""
+
+# Upper bound on driver.get(); Selenium's own default is five minutes
+PAGE_LOAD_TIMEOUT = 30
+
 class BrowserTools:
-    def __init__(self):
+    def __init__(self, driver_resolver=None):
         self.driver = None
+        self.page_load_timeout = None
+        self.driver_resolver = driver_resolver or Driver_Resolver.DEFAULT_RESOLVER
+        self.page_count = 0
+        self.started_at = None
+        self.blocking_profile = "none"
+        self.pool_slot = None
+        self.recycle_requested = False
+        self.last_ping_latency = None
         
-    def start_browser(self, headless=True):
-        """Start Chrome browser with automatic driver management"""
+    def start_browser(self, headless=True, blocking_profile="none", user_data_dir=None,
+                      disk_cache_dir=None, disk_cache_size=None):
+        """Start Chrome browser with a cached, locally resolved driver"""
         try:
             # Chrome options
             chrome_options = Options()
@@ -20,40 +119,103 @@ class BrowserTools:
                 chrome_options.add_argument("--headless")
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
+            # Return from get() at DOMContentLoaded; wait_for_page decides the rest
+            chrome_options.page_load_strategy = "eager"
+            # A persistent profile keeps cookies, consent state and the HTTP cache between runs
+            if user_data_dir:
+                chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+            if disk_cache_dir:
+                chrome_options.add_argument(f"--disk-cache-dir={disk_cache_dir}")
+            if disk_cache_size:
+                chrome_options.add_argument(f"--disk-cache-size={int(disk_cache_size)}")
+            prefs = Blocking_Profiles.chrome_prefs(blocking_profile)
+            if prefs:
+                chrome_options.add_experimental_option("prefs", prefs)
             
-            # Auto-download and setup ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            try:
+                self.driver = webdriver.Chrome(service=self._driver_service(), options=chrome_options)
+            except SessionNotCreatedException:
+                # The cached driver no longer matches Chrome, resolve it again
+                self.driver_resolver.invalidate()
+                self.driver = webdriver.Chrome(service=self._driver_service(), options=chrome_options)
+            self.page_count = 0
+            self.page_load_timeout = None
+            self.started_at = time.time()
+            self.blocking_profile = "none"
+            self.set_blocking_profile(blocking_profile)
             
             return {"status": "success", "message": "Browser started"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
-    def navigate_to(self, url):
-        """Navigate to a URL"""
+    def _driver_service(self):
+        driver_path = self.driver_resolver.resolve()
+        return Service(driver_path) if driver_path else Service()
+            
+    def set_blocking_profile(self, name):
+        """Block the profile's URL patterns for subsequent requests in this tab"""
+        try:
+            profile = Blocking_Profiles.get_profile(name)
+            if name != self.blocking_profile:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile["url_patterns"]})
+                self.blocking_profile = name
+            return {"status": "success", "profile": name}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+            
+    def _check_deadline(self, deadline):
+        if deadline is not None:
+            deadline.check("browser command")
+            
+    def _bounded(self, timeout, deadline):
+        """Clamp a step timeout to the task deadline; raises DeadlineExceeded once it has passed"""
+        if deadline is None:
+            return timeout
+        self._check_deadline(deadline)
+        return deadline.bound(timeout)
+            
+    def navigate_to(self, url, wait_for=None, timeout=10, network_idle=False, deadline=None):
+        """Navigate to a URL and wait until the page is usable"""
         try:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
+            page_load_timeout = max(1, int(self._bounded(PAGE_LOAD_TIMEOUT, deadline) + 0.5))
+            if page_load_timeout != self.page_load_timeout:
+                # A hung page raises TimeoutException instead of blocking the task
+                self.driver.set_page_load_timeout(page_load_timeout)
+                self.page_load_timeout = page_load_timeout
             self.driver.get(url)
-            time.sleep(2)  # Wait for page load
-            return {"status": "success", "url": self.driver.current_url}
+            self.page_count += 1
+            wait_result = wait_for_page(self.driver, timeout=self._bounded(timeout, deadline), selector=wait_for,
+                                        network_idle=network_idle)
+            return {"status": "success", "url": self.driver.current_url,
+                    "wait": wait_result["status"], "waited": wait_result["waited"]}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+            
+    def wait_for_page(self, selector=None, timeout=10, network_idle=False, stale_element=None, deadline=None):
+        """Wait for the current page to become usable"""
+        try:
+            return wait_for_page(self.driver, timeout=self._bounded(timeout, deadline), selector=selector,
+                                 network_idle=network_idle, stale_element=stale_element)
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
-    def click_element(self, selector):
+    def click_element(self, selector, deadline=None):
         """Click an element using CSS selector"""
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, self._bounded(10, deadline))
             element = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
             element.click()
             return {"status": "success"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
-    def type_text(self, selector, text):
+    def type_text(self, selector, text, deadline=None):
         """Type text into an element"""
         try:
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, self._bounded(10, deadline))
             element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
             element.clear()
             element.send_keys(text)
@@ -61,30 +223,109 @@ class BrowserTools:
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
-    def extract_text(self, selector=None):
-        """Extract text from page or specific element"""
+    def extract_text(self, selector=None, max_chars=None, deadline=None):
+        """Extract text from page or specific element, truncated in the page"""
         try:
+            self._check_deadline(deadline)
+            if max_chars is None:
+                max_chars = 20000 if selector else 500
+            page = self.driver.execute_script(PAGE_TEXT_SCRIPT, selector, max_chars)
             if selector:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                texts = [elem.text for elem in elements if elem.text.strip()]
+                texts = page["texts"]
             else:
                 # Extract page title and main content
-                title = self.driver.title
-                body = self.driver.find_element(By.TAG_NAME, "body").text[:500]
-                texts = [f"Title: {title}", f"Content: {body}"]
+                texts = [f"Title: {page['title']}", f"Content: {page['texts'][0]}"]
             
             return {"status": "success", "data": texts}
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
-    def get_page_title(self):
+    def extract_matching_lines(self, keywords=(), scan_lines=10, max_lines=10, max_line_chars=300, deadline=None):
+        """Return the page's leading lines that contain any keyword, filtered in the page"""
+        try:
+            self._check_deadline(deadline)
+            keywords = [word.lower() for word in keywords]
+            lines = self.driver.execute_script(MATCHING_LINES_SCRIPT, scan_lines, keywords, max_lines, max_line_chars)
+            return {"status": "success", "data": lines}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+            
+    def extract_elements(self, selectors, limit=5, first_match_only=False, deadline=None):
+        """Extract text, href and bounding box for elements matching any selector, in one script"""
+        try:
+            self._check_deadline(deadline)
+            if isinstance(selectors, str):
+                selectors = [selectors]
+            groups = self.driver.execute_script(BULK_EXTRACT_SCRIPT, list(selectors), limit, first_match_only)
+            return {"status": "success", "data": groups or []}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+            
+    def get_page_title(self, deadline=None):
         """Get current page title"""
         try:
+            self._check_deadline(deadline)
             return {"status": "success", "data": [self.driver.title]}
         except Exception as e:
             return {"status": "error", "message": str(e)}
             
+    def reset_state(self, clear_cookies=True):
+        """Clear cookies, storage and extra tabs so the browser can be reused"""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            if clear_cookies:
+                try:
+                    self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+                except Exception:
+                    pass  # about:blank and some origins deny storage access
+                try:
+                    # Clears cookies for every domain, not just the current one
+                    self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                except Exception:
+                    self.driver.delete_all_cookies()
+            self.driver.get("about:blank")
+            return {"status": "success"}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+            
+    def ping(self):
+        """Round-trip a trivial command and return its latency in seconds"""
+        start = time.time()
+        self.driver.execute_script("return 1;")
+        self.last_ping_latency = time.time() - start
+        return self.last_ping_latency
+            
+    def get_memory_usage(self):
+        """Resident memory of chromedriver and its Chrome processes in bytes, if psutil is installed"""
+        if psutil is None or self.driver is None:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+        except Exception:
+            return None
+            
+    def get_age(self):
+        """Seconds since the browser was started"""
+        if self.started_at is None:
+            return 0.0
+        return time.time() - self.started_at
+            
     def close_browser(self):
         """Close the browser"""
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            finally:
+                self.driver = None
@@ -0,0 +1,95 @@
+import threading
+
+class BrowserWatchdog:
+    """Background health checks for a BrowserPool"""
+
+    def __init__(self, pool, interval=30, max_rss_mb=1500, max_latency=5.0, ping_timeout=10):
+        self.pool = pool
+        self.interval = interval
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.max_latency = max_latency
+        self.ping_timeout = ping_timeout
+        self.stats = {"checks": 0, "unresponsive": 0, "slow": 0, "memory": 0, "flagged_in_use": 0}
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def check_once(self):
+        self.pool.check_idle(self._check_idle_browser)
+        for browser, state in self.pool.snapshot():
+            if state != "in_use" or browser.recycle_requested:
+                continue
+            rss = browser.get_memory_usage()
+            if rss is not None and rss > self.max_rss_bytes:
+                self.pool.mark_for_recycle(browser)
+                self._count("flagged_in_use")
+
+    def report(self):
+        """Per-browser and pool-wide health figures for sizing the fleet"""
+        browsers = []
+        for browser, state in self.pool.snapshot():
+            rss = browser.get_memory_usage()
+            browsers.append({"slot": browser.pool_slot,
+                             "state": state,
+                             "pages": browser.page_count,
+                             "age": browser.get_age(),
+                             "rss_mb": None if rss is None else rss / (1024 * 1024),
+                             "ping_latency": browser.last_ping_latency,
+                             "recycle_requested": browser.recycle_requested})
+        with self._lock:
+            watchdog_stats = dict(self.stats)
+        return {"pool": self.pool.get_stats(), "watchdog": watchdog_stats, "browsers": browsers}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check_once()
+            except Exception as e:
+                print(f"Browser watchdog check failed: {e}")
+
+    def _check_idle_browser(self, browser):
+        self._count("checks")
+        latency = self._ping(browser)
+        reason = None
+        if latency is None:
+            reason = "unresponsive"
+        elif latency > self.max_latency:
+            reason = "slow"
+        else:
+            rss = browser.get_memory_usage()
+            if rss is not None and rss > self.max_rss_bytes:
+                reason = "memory"
+        if reason:
+            self._count(reason)
+            print(f"Recycling browser in slot {browser.pool_slot}: {reason}")
+            return False
+        return True
+
+    def _ping(self, browser):
+        # A hung driver can block for minutes, so ping from a helper thread
+        result = {}
+
+        def ping():
+            try:
+                result["latency"] = browser.ping()
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=ping, daemon=True)
+        thread.start()
+        thread.join(self.ping_timeout)
+        return result.get("latency")
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
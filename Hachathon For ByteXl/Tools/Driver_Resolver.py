@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".web_navigator", "chromedriver.json")
+
+class DriverResolver:
+    """Resolves the ChromeDriver binary once and remembers it on disk"""
+
+    def __init__(self, driver_path=None, cache_path=DEFAULT_CACHE_PATH):
+        self.driver_path = driver_path
+        self.cache_path = cache_path
+        self._resolved = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        """Return a ChromeDriver path, or None to let Selenium Manager decide"""
+        if self.driver_path:
+            if not self._is_executable(self.driver_path):
+                raise FileNotFoundError(f"ChromeDriver not found at {self.driver_path}")
+            return self.driver_path
+        with self._lock:
+            if self._resolved is None:
+                self._resolved = self._resolve_cached()
+            return self._resolved
+
+    def invalidate(self):
+        """Forget the cached driver, e.g. after it failed to start Chrome"""
+        with self._lock:
+            self._resolved = None
+            if os.path.exists(self.cache_path):
+                os.remove(self.cache_path)
+
+    def _resolve_cached(self):
+        chrome_version = self._chrome_version()
+        cached = self._load_cache()
+        if cached and self._is_executable(cached.get("driver_path")):
+            # An undetectable Chrome version keeps the cached driver so
+            # air-gapped workers never reach for the network
+            if chrome_version is None or self._major(cached.get("chrome_version")) == self._major(chrome_version):
+                return cached["driver_path"]
+        try:
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            print(f"ChromeDriver resolution failed, falling back to Selenium Manager: {e}")
+            return None
+        self._save_cache({"driver_path": driver_path, "chrome_version": chrome_version})
+        return driver_path
+
+    def _chrome_version(self):
+        try:
+            return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except Exception:
+            return None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self, data):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not cache ChromeDriver path: {e}")
+
+    @staticmethod
+    def _major(version):
+        return str(version).split(".")[0] if version else None
+
+    @staticmethod
+    def _is_executable(path):
+        return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+# Shared so every BrowserTools in the process resolves the driver only once
+DEFAULT_RESOLVER = DriverResolver()
@@ -0,0 +1,138 @@
+import threading
+import time
+from html.parser import HTMLParser
+import requests
+
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+}
+JS_REQUIRED_HINTS = ["enable javascript", "javascript is required", "javascript is disabled",
+                     "turn on javascript", "requires javascript"]
+SKIPPED_TAGS = {"script", "style", "template", "noscript", "svg"}
+
+class _PageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.texts = []
+        self.noscript_text = []
+        self.script_count = 0
+        self._stack = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script":
+            self.script_count += 1
+        if tag in SKIPPED_TAGS or tag == "title":
+            self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._stack:
+            while self._stack and self._stack.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        data = data.strip()
+        if not data:
+            return
+        if "title" in self._stack:
+            self.title += data
+        elif "noscript" in self._stack:
+            self.noscript_text.append(data)
+        elif not self._stack:
+            self.texts.append(data)
+
+class HttpTools:
+    """Browserless fetch-and-parse backend with the read-only BrowserTools API"""
+
+    def __init__(self, timeout=10, min_text_chars=200, page_cache=None):
+        self.timeout = timeout
+        self.min_text_chars = min_text_chars
+        self.page_cache = page_cache
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        self._local = threading.local()
+
+    def start_browser(self, headless=True):
+        return {"status": "success", "message": "HTTP backend ready"}
+
+    def navigate_to(self, url, deadline=None):
+        """Fetch a URL and parse its title and visible text"""
+        self._local.page = None
+        try:
+            timeout = self.timeout
+            if deadline is not None:
+                deadline.check("HTTP fetch")
+                timeout = deadline.bound(timeout)
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+            start = time.time()
+            cached, state = self.page_cache.lookup(url) if self.page_cache else (None, None)
+            if state == "fresh":
+                return self._serve_cached(cached, "hit", start)
+            headers = {}
+            if state == "stale":
+                if cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+            response = self.session.get(url, timeout=timeout, headers=headers)
+            if response.status_code == 304 and cached is not None:
+                self.page_cache.mark_revalidated(url)
+                return self._serve_cached(cached, "revalidated", start)
+            if response.status_code >= 400:
+                return {"status": "error", "message": f"HTTP {response.status_code}"}
+            if "html" not in response.headers.get("Content-Type", ""):
+                return {"status": "needs_browser", "message": "Response is not HTML"}
+            parser = _PageParser()
+            parser.feed(response.text)
+            page = {"url": response.url, "title": parser.title, "texts": parser.texts}
+            reason = self._needs_javascript(parser)
+            if reason:
+                return {"status": "needs_browser", "message": reason}
+            self._local.page = page
+            if self.page_cache is not None:
+                self.page_cache.store(url, title=parser.title, text="\n".join(parser.texts), html=response.text,
+                                      etag=response.headers.get("ETag"),
+                                      last_modified=response.headers.get("Last-Modified"))
+            return {"status": "success", "url": response.url, "backend": "http",
+                    "cache": "miss", "fetch_time": time.time() - start}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+            
+    def _serve_cached(self, entry, cache_state, start):
+        self._local.page = {"url": entry["url"], "title": entry["title"],
+                            "texts": entry["text"].split("\n") if entry["text"] else []}
+        return {"status": "success", "url": entry["url"], "backend": "http",
+                "cache": cache_state, "fetch_time": time.time() - start}
+
+    def extract_text(self, selector=None):
+        """Extract the title and leading text of the fetched page"""
+        page = getattr(self._local, "page", None)
+        if page is None:
+            return {"status": "error", "message": "No page loaded"}
+        if selector:
+            return {"status": "needs_browser", "message": "Selectors need the browser backend"}
+        body = " ".join(page["texts"])[:500]
+        return {"status": "success", "data": [f"Title: {page['title']}", f"Content: {body}"]}
+
+    def get_page_title(self):
+        page = getattr(self._local, "page", None)
+        if page is None:
+            return {"status": "error", "message": "No page loaded"}
+        return {"status": "success", "data": [page["title"]] if page["title"] else []}
+
+    def close_browser(self):
+        self._local.page = None
+
+    def _needs_javascript(self, parser):
+        noscript = " ".join(parser.noscript_text).lower()
+        if any(hint in noscript for hint in JS_REQUIRED_HINTS):
+            return "Page asks for JavaScript"
+        text_chars = sum(len(text) for text in parser.texts)
+        if text_chars < self.min_text_chars and parser.script_count > 0:
+            return "Page content is rendered by scripts"
+        if not parser.title:
+            return "Page has no static title"
+        return None
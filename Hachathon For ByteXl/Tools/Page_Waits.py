@@ -0,0 +1,38 @@
+import time
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+def wait_for_page(driver, timeout=10, selector=None, network_idle=False, idle_time=0.5,
+                  stale_element=None, poll_interval=0.05):
+    """Poll until the page is usable instead of sleeping a fixed time"""
+    start = time.time()
+    deadline = start + timeout
+    ready_states = ("interactive", "complete") if selector else ("complete",)
+    navigated = stale_element is None
+    resource_count = None
+    idle_since = None
+    while True:
+        now = time.time()
+        try:
+            if not navigated:
+                try:
+                    stale_element.is_enabled()
+                except StaleElementReferenceException:
+                    navigated = True
+            if navigated and driver.execute_script("return document.readyState;") in ready_states:
+                found = not selector or bool(driver.find_elements(By.CSS_SELECTOR, selector))
+                idle = True
+                if found and network_idle:
+                    count = driver.execute_script(RESOURCE_COUNT_SCRIPT)
+                    if count != resource_count:
+                        resource_count, idle_since = count, now
+                    idle = now - idle_since >= idle_time
+                if found and idle:
+                    return {"status": "success", "waited": now - start}
+        except WebDriverException:
+            pass  # the document is being swapped out mid-navigation
+        if now >= deadline:
+            return {"status": "timeout", "waited": now - start}
+        time.sleep(min(poll_interval, max(0.0, deadline - now)))
@@ -1,39 +1,87 @@
 from main import WebNavigatorAgent
+from LLM.llm_scheduler import BATCH
+from deadline import Deadline
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import json
 import time
 
+# A site's own deadline stops its work; it returns a little after expiry (browser
+# release, rounded page-load timeout), so the outer timer only catches stuck sites
+SITE_TIMEOUT_GRACE = 5.0
+
 class AdvancedWebAgent(WebNavigatorAgent):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, config=None, max_concurrency=None, site_timeout=None, priority=BATCH):
+        super().__init__(config)
+        # Multi-site jobs yield the LLM to interactive users by default
+        self.priority = priority
+        self.max_concurrency = max_concurrency or self.config.MULTI_SITE_CONCURRENCY
+        self.site_timeout = site_timeout or self.config.SITE_TIMEOUT
         
     def smart_search(self, query, websites=['google.com', 'wikipedia.org']):
-        results = {}
-        for site in websites:
-            print(f"Searching {site}...")
-            task = f"Go to {site} and search for {query}"
-            result = self.process_request(task)
-            results[site] = result.get('extracted_data', [])
-        return results
+        tasks = {site: f"Go to {site} and search for {query}" for site in websites}
+        site_results = self._run_sites(tasks, "Searching")
+        return {site: site_results[site].get('extracted_data', []) for site in websites}
         
     def website_comparison(self, sites):
-        comparison = {}
-        for site in sites:
-            print(f"Analyzing {site}...")
-            task = f"Go to {site} and extract page information"
-            result = self.process_request(task)
-            comparison[site] = {
-                'status': result.get('status'),
-                'data': result.get('extracted_data', [])
-            }
-        return comparison
+        tasks = {site: f"Go to {site} and extract page information" for site in sites}
+        site_results = self._run_sites(tasks, "Analyzing")
+        return {site: {'status': site_results[site].get('status'),
+                       'data': site_results[site].get('extracted_data', [])}
+                for site in sites}
+        
+    def _run_sites(self, tasks, label):
+        """Run one task per site concurrently, each bounded by its own timeout"""
+        results = {}
+        started = {}
+        workers = max(1, min(self.max_concurrency, len(tasks)))
+        if self.browser_pool is not None:
+            workers = min(workers, self.browser_pool.size)
+        else:
+            # Without a pool every task starts and quits the one shared browser
+            workers = 1
+        
+        def run_site(site, task):
+            started[site] = time.time()
+            # The deadline cancels the site's browser and LLM work, not just the wait for it
+            return self.process_request(task, priority=self.priority, deadline=Deadline(self.site_timeout))
+        
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {}
+            for site, task in tasks.items():
+                print(f"{label} {site}...")
+                futures[executor.submit(run_site, site, task)] = site
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    site = futures[future]
+                    results[site] = future.result()
+                    print(f"Finished {site} in {time.time() - started[site]:.1f}s")
+                now = time.time()
+                for future in list(pending):
+                    site = futures[future]
+                    if site in started and now - started[site] > self.site_timeout + SITE_TIMEOUT_GRACE:
+                        pending.discard(future)
+                        results[site] = {"status": "error",
+                                         "message": f"Timed out after {self.site_timeout}s"}
+        finally:
+            # Timed-out sites finish in the background and hand their browser back to the pool
+            executor.shutdown(wait=False)
+        return results
         
     def generate_report(self, task, result):
-        summary_prompt = f"Summarize this web automation result: {result}"
+        snippets = [f"Status: {result.get('status')}"]
+        if result.get('message'):
+            snippets.append(f"Message: {result['message']}")
+        snippets.extend(str(item) for item in result.get('extracted_data', []))
+        context = self.context_builder.build(snippets, query=task, task="report")
+        summary_prompt = f"Task: {task}\nSummarize this web automation result:\n{context}"
         messages = [
             {"role": "system", "content": "Create a brief, professional summary of web automation results."},
             {"role": "user", "content": summary_prompt}
         ]
-        summary = self.llm.generate_response(messages)
+        summary = self.llm.generate_response(messages, priority=self.priority, call_site="report")
         report = {
             'task': task,
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
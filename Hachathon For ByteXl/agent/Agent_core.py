@@ -1,37 +1,123 @@
+import asyncio
 import json
 import re
+import threading
+from urllib.parse import urlparse
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from Tools.Blocking_Profiles import TASK_BLOCKING_PROFILES
+from LLM.context_builder import ContextBuilder
+from agent.Pipeline import PipelinedExecutor
+SEARCH_BOX_SELECTOR = "textarea[name='q'], input[name='q']"
+SEARCH_RESULTS_SELECTOR = "#search, #rso, div.g"
+RESULT_SELECTORS = ["div.g", ".tF2Cxc", "div[data-async-context]", ".ULSxyf", ".X7NTVe"]
+# Placeholders returned when nothing could be extracted; results built on them are flagged fallback
+EXTRACT_FAILED = "Could not extract detailed results, but search was performed"
+NO_RESULTS = "Search completed - check browser for results"
 
 class WebAgent:
-    def __init__(self, llm_handler, browser_tools):
+    def __init__(self, llm_handler, browser_tools, browser_pool=None, acquire_timeout=None,
+                 blocking_profiles=None, http_tools=None, page_cache=None, selector_stats=None,
+                 context_builder=None, pipelined=False, plan=False, search_url="google.com", site_base_url=None):
         self.llm = llm_handler
         self.browser = browser_tools
+        self.http = http_tools
+        self.page_cache = page_cache
+        self.selector_stats = selector_stats
+        self.context_builder = context_builder or ContextBuilder(getattr(llm_handler, "model", ""))
+        self.browser_pool = browser_pool
+        self.search_url = search_url
+        self.site_base_url = site_base_url
+        self.acquire_timeout = acquire_timeout
+        self.blocking_profiles = TASK_BLOCKING_PROFILES if blocking_profiles is None else blocking_profiles
+        self.pipeline = PipelinedExecutor(self, plan=plan) if pipelined else None
+        # Without a pool every task shares self.browser, so tasks take turns with it
+        self._browser_lock = threading.Lock()
 
-    def execute_task(self, user_input):
-        start_result = self.browser.start_browser()
-        if start_result.get("status") != "success":
-            return {"status": "error", "message": "Failed to start browser"}
+    def execute_task(self, user_input, on_token=None, deadline=None):
+        if self.pipeline is not None:
+            return self.pipeline.run(user_input, on_token, deadline)
+        
+        if self.http is not None and self.classify_task(user_input) == "navigation":
+            fast_result = self._try_http_navigation(user_input, deadline)
+            if fast_result is not None:
+                return fast_result
         
         try:
-            task_type = self.classify_task(user_input)
-            print(f"Task classified as: {task_type}")
+            browser = self._acquire_browser(deadline)
+        except Exception as e:
+            return {"status": "error", "message": f"Failed to start browser: {e}"}
+        return self.mark_partial(self._run_in_browser(browser, user_input, on_token, deadline=deadline), deadline)
+            
+    async def execute_task_async(self, user_input, on_token=None, deadline=None):
+        """Awaitable execute_task; with a browser pool concurrent calls each get a browser, without one they queue"""
+        return await asyncio.to_thread(self.execute_task, user_input, on_token, deadline)
+        
+    @staticmethod
+    def mark_partial(result, deadline):
+        """Flag a result that was cut short by its deadline; whatever it holds is still returned"""
+        if deadline is not None and deadline.expired():
+            result["partial"] = True
+        return result
+            
+    def _acquire_browser(self, deadline=None):
+        """Check out a browser for one task; raises when none is available in time"""
+        timeout = self.acquire_timeout if deadline is None else deadline.bound(self.acquire_timeout)
+        if self.browser_pool is not None:
+            return self.browser_pool.acquire(timeout)
+        if not self._browser_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError("Browser is busy with another task")
+        try:
+            start_result = self.browser.start_browser()
+            if start_result.get("status") != "success":
+                raise RuntimeError(start_result.get("message", "browser did not start"))
+        except Exception:
+            self._browser_lock.release()
+            raise
+        return self.browser
+
+    def _release_browser(self, browser):
+        if self.browser_pool is not None:
+            self.browser_pool.release(browser)
+            return
+        try:
+            browser.close_browser()
+        finally:
+            self._browser_lock.release()
             
-            if task_type == "shopping":
-                return self._handle_shopping(user_input)
-            elif task_type == "navigation":
-                return self._handle_navigation(user_input)
-            elif task_type == "question":
-                return self._handle_question(user_input)
-            elif task_type == "search":
-                return self._handle_search(user_input)
-            else:
-                return self._handle_general(user_input)
+    def _run_in_browser(self, browser, user_input, on_token=None, task_type=None, deadline=None):
+        """Run a task on a checked-out browser, then hand the browser back"""
+        try:
+            # A task-local agent keeps concurrent tasks off each other's browser
+            task_agent = self._task_agent(browser) if self.browser_pool is not None else self
+            return task_agent._run_task(user_input, on_token, task_type, deadline)
         finally:
-            self.browser.close_browser()
+            self._release_browser(browser)
+            
+    def _task_agent(self, browser):
+        return WebAgent(self.llm, browser, blocking_profiles=self.blocking_profiles,
+                        page_cache=self.page_cache, selector_stats=self.selector_stats,
+                        context_builder=self.context_builder, search_url=self.search_url,
+                        site_base_url=self.site_base_url)
+            
+    def _run_task(self, user_input, on_token=None, task_type=None, deadline=None):
+        if task_type is None:
+            task_type = self.classify_task(user_input)
+            print(f"Task classified as: {task_type}")
+        self.browser.set_blocking_profile(self.blocking_profiles.get(task_type, "none"))
+        
+        if task_type == "shopping":
+            return self._handle_shopping(user_input, on_token, deadline)
+        elif task_type == "navigation":
+            return self._handle_navigation(user_input, deadline)
+        elif task_type == "question":
+            return self._handle_question(user_input, on_token, deadline)
+        elif task_type == "search":
+            return self._handle_search(user_input, on_token, deadline)
+        else:
+            return self._handle_general(user_input, on_token, deadline)
             
     def classify_task(self, user_input):
         text = user_input.lower().strip()
@@ -51,60 +137,72 @@ class WebAgent:
             return "search"
         return "general"
         
-    def _handle_shopping(self, user_input):
-        nav_result = self.browser.navigate_to("google.com")
+    def _handle_shopping(self, user_input, on_token=None, deadline=None):
+        nav_result = self.browser.navigate_to(self.search_url, wait_for=SEARCH_BOX_SELECTOR, deadline=deadline)
         if nav_result.get("status") != "success":
             return {"status": "error", "message": "Could not access Google"}
         
         try:
-            wait = WebDriverWait(self.browser.driver, 10)
+            wait = WebDriverWait(self.browser.driver, self._step_timeout(10, deadline))
             search_box = wait.until(EC.presence_of_element_located((By.NAME, "q")))
             search_box.clear()
             search_box.send_keys(user_input)
             search_box.send_keys(Keys.RETURN)
-            time.sleep(3)
-            results = self._extract_search_results()
-            formatted_results = self._format_shopping_results(user_input, results)
+            self.browser.wait_for_page(selector=SEARCH_RESULTS_SELECTOR, stale_element=search_box,
+                                       deadline=deadline)
+            results = self._extract_search_results(deadline=deadline)
+            formatted_results = self._format_shopping_results(user_input, results, on_token, deadline)
             return {"status": "completed",
                     "extracted_data": formatted_results,
-                    "execution_log": [nav_result, {"status": "success", "action": "search_performed"}]}
+                    "execution_log": [nav_result, {"status": "success", "action": "search_performed"}],
+                    "fallback": results[0] in (EXTRACT_FAILED, NO_RESULTS)}
         except:
             extract_result = self.browser.extract_text()
             return {"status": "completed",
                     "extracted_data": [f"Search performed for: {user_input}", "Found Google search results"],
-                    "execution_log": [nav_result]}
+                    "execution_log": [nav_result],
+                    "fallback": True}
     
-    def _extract_search_results(self):
+    def _extract_search_results(self, page_type="search", deadline=None):
         results = []
         try:
-            selectors = ["div.g", ".tF2Cxc", "div[data-async-context]", ".ULSxyf", ".X7NTVe"]
-            for selector in selectors:
-                elements = self.browser.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    for i, element in enumerate(elements[:5]):
-                        try:
-                            text = element.text.strip()
-                            if text and len(text) > 10:
-                                results.append(f"Result {i+1}: {text[:200]}...")
-                        except:
-                            continue
-                    break
+            domain = urlparse(self.browser.driver.current_url).netloc
+            selectors = RESULT_SELECTORS
+            if self.selector_stats is not None:
+                selectors = self.selector_stats.rank(domain, page_type, RESULT_SELECTORS)
+            extract_result = self.browser.extract_elements(selectors, limit=5, first_match_only=True,
+                                                           deadline=deadline)
+            matched = None
+            for group in extract_result.get("data", []):
+                matched = group["selector"]
+                for i, item in enumerate(group["items"]):
+                    text = item["text"]
+                    if text and len(text) > 10:
+                        results.append(f"Result {i+1}: {text[:200]}...")
+            if self.selector_stats is not None and extract_result.get("status") == "success":
+                self._record_selectors(domain, page_type, selectors, matched, bool(results))
             if not results:
-                page_text = self.browser.driver.find_element(By.TAG_NAME, "body").text
-                lines = page_text.split('\n')
-                for line in lines[:10]:
-                    if any(word in line.lower() for word in ['price', '₹', 'buy', 'rating', 'review']):
-                        results.append(line.strip())
+                lines_result = self.browser.extract_matching_lines(
+                    keywords=['price', '₹', 'buy', 'rating', 'review'], scan_lines=10, deadline=deadline)
+                results.extend(lines_result.get("data", []))
         except:
-            results = ["Could not extract detailed results, but search was performed"]
-        return results if results else ["Search completed - check browser for results"]
+            results = [EXTRACT_FAILED]
+        return results if results else [NO_RESULTS]
+    
+    def _record_selectors(self, domain, page_type, selectors, matched, found_results):
+        # Selectors ranked ahead of the match were tried in-page and found nothing
+        for selector in selectors:
+            if selector == matched:
+                self.selector_stats.record(domain, page_type, selector, found_results)
+                break
+            self.selector_stats.record(domain, page_type, selector, False)
     
-    def _format_shopping_results(self, query, raw_results):
+    def _format_shopping_results(self, query, raw_results, on_token=None, deadline=None):
         try:
-            context = "\n".join(raw_results[:5])
+            context = self.context_builder.build(raw_results, query=query, task="shopping")
             messages = [{"role": "system", "content": "You are a helpful shopping assistant. Format search results into a clean, useful summary for the user. Focus on products, prices, and key details."},
                         {"role": "user", "content": f"User searched for: '{query}'\n\nSearch results found:\n{context}\n\nPlease format this into a helpful shopping summary:"}]
-            formatted_response = self.llm.generate_response(messages)
+            formatted_response = self._complete(messages, on_token, call_site="summary", deadline=deadline)
             return [f"Shopping Search Results for: {query}",
                     f"AI Summary: {formatted_response}",
                     "Raw Results:",
@@ -112,47 +210,69 @@ class WebAgent:
         except:
             return [f"Shopping Search Results for: {query}", *raw_results[:5]]
     
-    def _handle_navigation(self, user_input):
-        url = self._extract_url(user_input)
+    def _try_http_navigation(self, user_input, deadline=None):
+        """Serve a navigation task without a browser; None means escalate to Selenium"""
+        url = self._site_url(self._extract_url(user_input))
+        if not url:
+            return None
+        nav_result = self.http.navigate_to(url, deadline=deadline)
+        if nav_result.get("status") != "success":
+            print(f"HTTP fast path skipped: {nav_result.get('message')}")
+            return None
+        extract_result = self.http.get_page_title()
+        if not extract_result.get("data"):
+            return None
+        return {"status": "completed",
+                "extracted_data": extract_result["data"],
+                "execution_log": [nav_result, extract_result]}
+        
+    def _handle_navigation(self, user_input, deadline=None):
+        url = self._site_url(self._extract_url(user_input))
         if url:
-            nav_result = self.browser.navigate_to(url)
+            nav_result = self.browser.navigate_to(url, deadline=deadline)
             if nav_result.get("status") == "success":
-                extract_result = self.browser.get_page_title()
+                extract_result = self.browser.get_page_title(deadline=deadline)
+                if self.page_cache is not None and extract_result.get("data"):
+                    # Lets the HTTP fast path answer repeats of script-rendered pages
+                    self.page_cache.store(url, title=extract_result["data"][0])
                 return {"status": "completed",
                         "extracted_data": extract_result.get("data", []),
                         "execution_log": [nav_result, extract_result]}
         return {"status": "error", "message": "Could not find URL to navigate to"}
         
-    def _handle_question(self, user_input):
+    def _handle_question(self, user_input, on_token=None, deadline=None):
         topic = self._extract_question_topic(user_input)
-        nav_result = self.browser.navigate_to("google.com")
+        nav_result = self.browser.navigate_to(self.search_url, wait_for=SEARCH_BOX_SELECTOR, deadline=deadline)
         if nav_result.get("status") != "success":
             return {"status": "error", "message": "Could not access search engine"}
         try:
-            wait = WebDriverWait(self.browser.driver, 10)
+            wait = WebDriverWait(self.browser.driver, self._step_timeout(10, deadline))
             search_box = wait.until(EC.presence_of_element_located((By.NAME, "q")))
             search_box.clear()
             search_box.send_keys(topic)
             search_box.send_keys(Keys.RETURN)
-            time.sleep(2)
-            results = self._extract_search_results()
-            answer = self._generate_answer(user_input, results)
+            self.browser.wait_for_page(selector=SEARCH_RESULTS_SELECTOR, stale_element=search_box,
+                                       deadline=deadline)
+            results = self._extract_search_results(deadline=deadline)
+            answer = self._generate_answer(user_input, results, on_token, deadline)
             return {"status": "completed",
                     "extracted_data": [f"Answer: {answer}"],
-                    "execution_log": [nav_result, {"status": "success", "action": "search_performed"}]}
+                    "execution_log": [nav_result, {"status": "success", "action": "search_performed"}],
+                    "fallback": results[0] in (EXTRACT_FAILED, NO_RESULTS)}
         except:
-            extract_result = self.browser.extract_text()
-            answer = self._generate_answer(user_input, extract_result.get("data", []))
+            extract_result = self.browser.extract_text(deadline=deadline)
+            answer = self._generate_answer(user_input, extract_result.get("data", []), on_token, deadline)
             return {"status": "completed",
                     "extracted_data": [f"Answer: {answer}"],
-                    "execution_log": [nav_result, extract_result]}
+                    "execution_log": [nav_result, extract_result],
+                    "fallback": True}
         
-    def _handle_search(self, user_input):
+    def _handle_search(self, user_input, on_token=None, deadline=None):
         search_term = user_input.replace("search for", "").replace("find", "").strip()
-        return self._handle_shopping(search_term)
+        return self._handle_shopping(search_term, on_token, deadline)
         
-    def _handle_general(self, user_input):
-        return self._handle_shopping(user_input)
+    def _handle_general(self, user_input, on_token=None, deadline=None):
+        return self._handle_shopping(user_input, on_token, deadline)
     
     def _extract_question_topic(self, question):
         question = question.lower()
@@ -160,15 +280,41 @@ class WebAgent:
             question = question.replace(phrase, "").strip()
         return question
         
-    def _generate_answer(self, question, web_data):
+    def _generate_answer(self, question, web_data, on_token=None, deadline=None):
         try:
-            context = " ".join(web_data[:3]) if web_data else "Search results"
+            context = self.context_builder.build(web_data or [], query=question, task="question",
+                                                 separator=" ") or "Search results"
             messages = [{"role": "system", "content": "Answer questions helpfully based on the context provided."},
                         {"role": "user", "content": f"Question: {question}\nContext: {context}\nAnswer:"}]
-            return self.llm.generate_response(messages)
+            return self._complete(messages, on_token, call_site="answer", deadline=deadline)
         except:
             return f"I found information about: {self._extract_question_topic(question)}"
         
+    def _complete(self, messages, on_token=None, call_site=None, deadline=None):
+        """Generate a reply, streaming tokens to on_token as they arrive when it is given"""
+        if on_token is None:
+            return self.llm.generate_response(messages, call_site=call_site, deadline=deadline)
+        tokens = []
+        try:
+            for token in self.llm.stream_response(messages, call_site=call_site, deadline=deadline):
+                tokens.append(token)
+                on_token(token)
+        except TimeoutError:
+            if not tokens:
+                raise
+            # Keep what streamed before the deadline; the result is marked partial
+        return "".join(tokens)
+        
+    @staticmethod
+    def _step_timeout(timeout, deadline):
+        return timeout if deadline is None else max(0.1, deadline.bound(timeout))
+        
+    def _site_url(self, domain):
+        # A site base (e.g. the benchmark fixture server) stands in for the real sites
+        if domain and self.site_base_url:
+            return self.site_base_url.rstrip("/") + "/" + domain
+        return domain
+        
     def _extract_url(self, text):
         domains = ["google.com", "wikipedia.org", "example.com", "github.com"]
         text_lower = text.lower()
@@ -0,0 +1,98 @@
+import contextvars
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from LLM.task_actions import actions_to_dicts
+
+# LLM call site each task type ends in, so the right model is preloaded
+TASK_CALL_SITES = {"shopping": "summary", "search": "summary", "general": "summary", "question": "answer"}
+
+class PipelinedExecutor:
+    """Runs a task's independent start-up stages concurrently and records per-stage timings"""
+
+    def __init__(self, agent, plan=False, max_workers=16):
+        self.agent = agent
+        self.plan = plan
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+
+    def run(self, user_input, on_token=None, deadline=None):
+        agent = self.agent
+        start = time.time()
+        timings = {}
+        task_type = agent.classify_task(user_input)
+        timings["classify"] = time.time() - start
+        print(f"Task classified as: {task_type}")
+
+        use_http = agent.http is not None and task_type == "navigation"
+        stages = {}
+        if task_type in TASK_CALL_SITES:
+            stages["preload"] = self._stage(timings, "preload", agent.llm.preload, TASK_CALL_SITES[task_type],
+                                            deadline=deadline)
+            if self.plan:
+                stages["plan"] = self._stage(timings, "plan", agent.llm.parse_task, user_input, structured=True,
+                                             deadline=deadline)
+        speculative = None
+        if use_http:
+            # Never wait for a busy pool or start Chrome on speculation: the fast path usually wins
+            if agent.browser_pool is not None:
+                speculative = agent.browser_pool.try_acquire_idle()
+            stages["http"] = self._stage(timings, "http", agent._try_http_navigation, user_input, deadline)
+        else:
+            stages["browser"] = self._stage(timings, "browser", agent._acquire_browser, deadline)
+
+        result = stages["http"].result() if use_http else None
+        if result is not None:
+            if speculative is not None:
+                agent.browser_pool.release(speculative, reset=False)
+        else:
+            if speculative is not None:
+                timings["browser"] = 0.0
+                stages["browser"] = Future()
+                stages["browser"].set_result(speculative)
+            elif "browser" not in stages:
+                stages["browser"] = self._stage(timings, "browser", agent._acquire_browser, deadline)
+            result = self._run_in_browser(stages["browser"], user_input, on_token, task_type, timings, deadline)
+
+        if "plan" in stages:
+            plan = self._stage_result(stages["plan"], None if deadline is None else deadline.remaining())
+            if isinstance(plan, dict) and plan.get("status") == "success":
+                result["plan"] = actions_to_dicts(plan["actions"])
+        total = time.time() - start
+        timings["total"] = total
+        stage_time = sum(value for name, value in timings.items() if name != "total")
+        timings["overlap_saved"] = max(0.0, stage_time - total)
+        # Stages still running in the background must not mutate the returned dict
+        result["timings"] = dict(timings)
+        return agent.mark_partial(result, deadline)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def _run_in_browser(self, browser_stage, user_input, on_token, task_type, timings, deadline):
+        agent = self.agent
+        try:
+            browser = browser_stage.result()
+        except Exception as e:
+            return {"status": "error", "message": f"Failed to start browser: {e}"}
+        task_start = time.time()
+        try:
+            return agent._run_in_browser(browser, user_input, on_token, task_type, deadline)
+        finally:
+            timings["task"] = time.time() - task_start
+
+    def _stage(self, timings, name, fn, *args, **kwargs):
+        def timed():
+            stage_start = time.time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                timings[name] = time.time() - stage_start
+        # Carry the caller's LLM priority into the stage thread
+        return self._executor.submit(contextvars.copy_context().run, timed)
+
+    @staticmethod
+    def _stage_result(future, timeout=None):
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            print(f"Pipeline stage failed: {e}")
+            return None
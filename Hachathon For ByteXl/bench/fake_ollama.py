@@ -0,0 +1,194 @@
+"""Ollama-compatible stand-in server for benchmarks.
+
+Serves /api/chat (streaming and not), /api/generate, /api/embed and
+/api/tags with a configurable model load time, time to first token and
+tokens per second, so end-to-end runs are repeatable without a GPU:
+
+    python -m bench.fake_ollama --port 11435 --tokens-per-sec 40
+    OLLAMA_HOST=http://127.0.0.1:11435 streamlit run Runnable2.py
+"""
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_MODELS = ["qwen2.5:0.5b", "qwen2.5:1.5b", "qwen2.5:3b", "nomic-embed-text"]
+REPLY_WORDS = ("Here is a concise summary of the results found . The top options are listed with "
+               "their prices , ratings and key details so you can compare them quickly .").split()
+EMBED_DIM = 384
+
+class FakeOllamaSettings:
+    def __init__(self, models=None, load_time=0.5, first_token_latency=0.15, tokens_per_sec=50.0,
+                 reply_tokens=60):
+        self.models = list(models or DEFAULT_MODELS)
+        self.load_time = load_time
+        self.first_token_latency = first_token_latency
+        self.tokens_per_sec = tokens_per_sec
+        self.reply_tokens = reply_tokens
+        self.loaded = set()
+        self.lock = threading.Lock()
+        self.stats = {"chat": 0, "generate": 0, "embed": 0, "cancelled": 0}
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+def _embed(text):
+    # Hashed bag of words: deterministic, and paraphrases with shared words land close together
+    vector = [0.0] * EMBED_DIM
+    for word in text.lower().split():
+        digest = hashlib.md5(word.encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "little") % EMBED_DIM] += 1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+def _reply_for(request, count):
+    schema = request.get("format")
+    if isinstance(schema, dict) and "actions" in schema.get("properties", {}):
+        return json.dumps({"actions": [{"action": "navigate_to", "url": "https://example.com"},
+                                       {"action": "extract_text", "selector": "body"}]})
+    if schema:
+        return "{}"
+    return " ".join(REPLY_WORDS[i % len(REPLY_WORDS)] for i in range(count))
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    settings = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            models = [{"name": name, "model": name, "modified_at": _now(), "size": 0, "digest": ""}
+                      for name in self.settings.models]
+            return self._send_json({"models": models})
+        if self.path.rstrip("/") == "/api/version":
+            return self._send_json({"version": "0.0.0-fake"})
+        self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.rstrip("/")
+        if path == "/api/chat":
+            return self._chat(request)
+        if path == "/api/generate":
+            return self._generate(request)
+        if path in ("/api/embed", "/api/embeddings"):
+            return self._embed(request)
+        self._send_json({"error": "not found"}, status=404)
+
+    def _load(self, model):
+        if model not in self.settings.models:
+            return False
+        with self.settings.lock:
+            loaded = model in self.settings.loaded
+            self.settings.loaded.add(model)
+        if not loaded:
+            time.sleep(self.settings.load_time)
+        return True
+
+    def _chat(self, request):
+        model = request.get("model", "")
+        if not self._load(model):
+            return self._send_json({"error": f"model '{model}' not found"}, status=404)
+        self._count("chat")
+        prompt_chars = sum(len(message.get("content", "")) for message in request.get("messages", []))
+        reply = _reply_for(request, self.settings.reply_tokens)
+        # JSON replies stream as one chunk; prose streams word by word
+        tokens = [reply] if request.get("format") else [word + " " for word in reply.split()]
+        done = {"model": model, "created_at": _now(), "message": {"role": "assistant", "content": ""},
+                "done": True, "done_reason": "stop", "prompt_eval_count": max(1, prompt_chars // 4),
+                "eval_count": len(tokens)}
+        start = time.time()
+        time.sleep(self.settings.first_token_latency)
+        if not request.get("stream", True):
+            time.sleep(len(tokens) / self.settings.tokens_per_sec)
+            done["message"]["content"] = "".join(tokens)
+            done["total_duration"] = int((time.time() - start) * 1e9)
+            return self._send_json(done)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                self._write_chunk({"model": model, "created_at": _now(),
+                                   "message": {"role": "assistant", "content": token}, "done": False})
+                time.sleep(1.0 / self.settings.tokens_per_sec)
+            done["total_duration"] = int((time.time() - start) * 1e9)
+            self._write_chunk(done)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream, like Ollama we stop generating
+            self._count("cancelled")
+            self.close_connection = True
+
+    def _generate(self, request):
+        model = request.get("model", "")
+        if not self._load(model):
+            return self._send_json({"error": f"model '{model}' not found"}, status=404)
+        self._count("generate")
+        self._send_json({"model": model, "created_at": _now(), "response": "", "done": True,
+                         "done_reason": "load"})
+
+    def _embed(self, request):
+        model = request.get("model", "")
+        if not self._load(model):
+            return self._send_json({"error": f"model '{model}' not found"}, status=404)
+        self._count("embed")
+        inputs = request.get("input", request.get("prompt", ""))
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        self._send_json({"model": model, "embeddings": [_embed(text) for text in inputs]})
+
+    def _write_chunk(self, payload):
+        body = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(body):x}\r\n".encode("ascii") + body + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, key):
+        with self.settings.lock:
+            self.settings.stats[key] += 1
+
+def serve(host="127.0.0.1", port=11435, settings=None):
+    """Start the server on a daemon thread; returns (server, base_url)"""
+    handler = type("Handler", (FakeOllamaHandler,), {"settings": settings or FakeOllamaSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--load-time", type=float, default=0.5, help="seconds to 'load' a model the first time")
+    parser.add_argument("--first-token-latency", type=float, default=0.15)
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0)
+    parser.add_argument("--reply-tokens", type=int, default=60)
+    args = parser.parse_args()
+    settings = FakeOllamaSettings(args.models, args.load_time, args.first_token_latency,
+                                  args.tokens_per_sec, args.reply_tokens)
+    server, url = serve(args.host, args.port, settings)
+    print(f"Fake Ollama listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
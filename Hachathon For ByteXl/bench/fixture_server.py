@@ -0,0 +1,161 @@
+"""Canned web for benchmarks: a Google-style search engine plus product and site pages.
+
+Pages are rendered from the JSON fixtures in bench/fixtures with the markup
+the agent's selectors expect (input[name=q], #search/#rso, div.g .tF2Cxc),
+and an optional per-request latency stands in for the network:
+
+    python -m bench.fixture_server --port 8765 --latency 0.05
+    WEBNAV_SEARCH_URL=http://127.0.0.1:8765/ WEBNAV_SITE_BASE=http://127.0.0.1:8765/sites/ ...
+"""
+import argparse
+import html
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>Search</title></head>
+<body><form action="/search" method="get" role="search">
+<input name="q" type="text" autocomplete="off" aria-label="Search">
+<input type="submit" value="Search">
+</form></body></html>"""
+
+RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><title>{query} - Search</title></head>
+<body>
+<form action="/search" method="get" role="search"><input name="q" type="text" value="{query}"></form>
+<div id="search"><div id="rso">
+{results}
+</div></div>
+</body></html>"""
+
+RESULT_BLOCK = """<div class="g"><div class="tF2Cxc">
+<a href="{href}"><h3>{title}</h3><cite>{cite}</cite></a>
+<div class="VwiC3b">{snippet}</div>
+</div></div>"""
+
+PRODUCT_PAGE = """<!DOCTYPE html>
+<html><head><title>{name} | Fixture Store</title></head>
+<body><div id="product">
+<h1>{name}</h1>
+<div class="price">Price: {price}</div>
+<div class="rating">Rating: {rating} out of 5</div>
+<p class="description">{description}</p>
+<button id="buy">Buy now</button>
+</div></body></html>"""
+
+SITE_PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head>
+<body><main><h1>{title}</h1><p>{body}</p></main></body></html>"""
+
+def _load(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+def _words(text):
+    return set(re.findall(r"\w+", text.lower()))
+
+class FixtureSite:
+    def __init__(self, latency=0.0, results_per_page=8):
+        self.latency = latency
+        self.results_per_page = results_per_page
+        self.products = {product["slug"]: product for product in _load("products.json")}
+        self.articles = {article["slug"]: article for article in _load("articles.json")}
+        self.sites = _load("sites.json")
+
+    def search(self, query):
+        terms = _words(query)
+        entries = []
+        for product in self.products.values():
+            text = f"{product['name']} {product['keywords']} {product['description']}"
+            entries.append((len(terms & _words(text)), f"/product/{product['slug']}", product["name"],
+                            f"fixture-store.test › product › {product['slug']}",
+                            f"{product['price']} · Rating {product['rating']} · {product['description']}"))
+        for article in self.articles.values():
+            text = f"{article['title']} {article['keywords']} {article['summary']}"
+            entries.append((len(terms & _words(text)), f"/wiki/{article['slug']}", article["title"],
+                            f"en.wikipedia.test › wiki › {article['slug']}", article["summary"]))
+        # Best matches first; unmatched queries still get a full page, like a real engine
+        entries.sort(key=lambda entry: -entry[0])
+        return entries[:self.results_per_page]
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    site = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.site.latency:
+            time.sleep(self.site.latency)
+        url = urlparse(self.path)
+        path = url.path.rstrip("/") or "/"
+        if path == "/":
+            return self._send_html(HOME_PAGE)
+        if path == "/search":
+            query = parse_qs(url.query).get("q", [""])[0]
+            return self._send_html(self._results_page(query))
+        match = re.fullmatch(r"/product/([\w-]+)", path)
+        if match and match.group(1) in self.site.products:
+            product = self.site.products[match.group(1)]
+            return self._send_html(PRODUCT_PAGE.format(**{key: html.escape(str(value))
+                                                          for key, value in product.items()}))
+        match = re.fullmatch(r"/wiki/([\w-]+)", path)
+        if match and match.group(1) in self.site.articles:
+            article = self.site.articles[match.group(1)]
+            return self._send_html(SITE_PAGE.format(title=html.escape(article["title"]),
+                                                    body=html.escape(article["summary"])))
+        match = re.fullmatch(r"/sites/([\w.-]+)", path)
+        if match:
+            page = self.site.sites.get(match.group(1).lower())
+            if page is None:
+                page = {"title": match.group(1), "body": f"Fixture page for {match.group(1)}. " * 10}
+            return self._send_html(SITE_PAGE.format(title=html.escape(page["title"]),
+                                                    body=html.escape(page["body"])))
+        self._send_html("<html><head><title>Not found</title></head><body>Not found</body></html>", 404)
+
+    def _results_page(self, query):
+        blocks = [RESULT_BLOCK.format(href=href, title=html.escape(title), cite=html.escape(cite),
+                                      snippet=html.escape(snippet))
+                  for _, href, title, cite, snippet in self.site.search(query)]
+        return RESULTS_PAGE.format(query=html.escape(query), results="\n".join(blocks))
+
+    def _send_html(self, page, status=200):
+        body = page.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=60")
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(host="127.0.0.1", port=8765, site=None):
+    """Start the server on a daemon thread; returns (server, base_url)"""
+    handler = type("Handler", (FixtureHandler,), {"site": site or FixtureSite()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Canned web fixture server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    server, url = serve(args.host, args.port, FixtureSite(latency=args.latency))
+    print(f"Fixture server listening on {url} (search: {url}/, sites: {url}/sites/<domain>)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""End-to-end benchmarks for WebNavigatorAgent and AdvancedWebAgent.
+
+Runs the task corpus through process_request at several concurrency levels
+and the AdvancedWebAgent multi-site methods, then reports latency
+percentiles, a per-stage breakdown (from result["timings"]) and throughput.
+By default the fake Ollama and fixture servers are started in-process, so
+only Chrome is needed. Results are written as JSON and can be compared with
+a stored baseline; the exit status is 1 when a metric regresses:
+
+    python -m bench.run_benchmarks --concurrency 1 2 4 --output bench/results.json
+    python -m bench.run_benchmarks --baseline bench/baseline.json
+"""
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.Adavanced_Agent import AdvancedWebAgent
+from bench import fake_ollama, fixture_server
+from config import CONFIG
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.json")
+LATENCY_METRICS = ("p50", "p95", "p99")
+# Absolute error-rate increase tolerated before it counts as a regression
+ERROR_RATE_SLACK = 0.05
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(latencies):
+    return {"count": len(latencies),
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None}
+
+def run_task(agent, entry):
+    start = time.perf_counter()
+    try:
+        result = agent.process_request(entry["task"])
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+    return {"category": entry["category"],
+            "latency": time.perf_counter() - start,
+            "status": result.get("status"),
+            "partial": bool(result.get("partial")),
+            "timings": result.get("timings", {})}
+
+def run_level(agent, tasks, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(lambda entry: run_task(agent, entry), tasks))
+    wall = time.perf_counter() - start
+    by_category = defaultdict(list)
+    stages = defaultdict(list)
+    for sample in samples:
+        by_category[sample["category"]].append(sample["latency"])
+        for stage, seconds in sample["timings"].items():
+            stages[stage].append(seconds)
+    errors = sum(1 for sample in samples if sample["status"] not in ("success", "completed"))
+    return {"concurrency": concurrency,
+            "requests": len(samples),
+            "wall_time": wall,
+            "throughput": len(samples) / wall if wall else None,
+            "error_rate": errors / len(samples) if samples else 0.0,
+            "partial_rate": sum(sample["partial"] for sample in samples) / len(samples) if samples else 0.0,
+            "latency": summarize([sample["latency"] for sample in samples]),
+            "categories": {category: summarize(values) for category, values in by_category.items()},
+            "stages": {stage: summarize(values) for stage, values in stages.items()}}
+
+def run_advanced(agent, advanced, iterations):
+    timings = defaultdict(list)
+    for _ in range(iterations):
+        for job in advanced.get("smart_search", []):
+            start = time.perf_counter()
+            agent.smart_search(job["query"], job["websites"])
+            timings["smart_search"].append(time.perf_counter() - start)
+        for sites in advanced.get("website_comparison", []):
+            start = time.perf_counter()
+            agent.website_comparison(sites)
+            timings["website_comparison"].append(time.perf_counter() - start)
+    return {method: summarize(values) for method, values in timings.items()}
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions of results against baseline"""
+    regressions = []
+
+    def check_latency(label, current, previous):
+        for metric in LATENCY_METRICS:
+            now, before = current.get(metric), previous.get(metric)
+            if now is not None and before and now > before * (1 + tolerance):
+                regressions.append(f"{label} {metric}: {before:.3f}s -> {now:.3f}s")
+
+    for level, previous in baseline.get("levels", {}).items():
+        current = results["levels"].get(level)
+        if current is None:
+            continue
+        check_latency(f"concurrency {level} latency", current["latency"], previous["latency"])
+        for category, stats in previous.get("categories", {}).items():
+            if category in current["categories"]:
+                check_latency(f"concurrency {level} {category}", current["categories"][category], stats)
+        if previous.get("throughput") and current["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(f"concurrency {level} throughput: "
+                               f"{previous['throughput']:.2f}/s -> {current['throughput']:.2f}/s")
+        if current["error_rate"] > previous.get("error_rate", 0.0) + ERROR_RATE_SLACK:
+            regressions.append(f"concurrency {level} error rate: "
+                               f"{previous.get('error_rate', 0.0):.1%} -> {current['error_rate']:.1%}")
+    for method, previous in baseline.get("advanced", {}).items():
+        if method in results.get("advanced", {}):
+            check_latency(f"advanced {method}", results["advanced"][method], previous)
+    return regressions
+
+def print_report(results):
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    print(f"\n{'conc':>4} {'reqs':>5} {'req/s':>7} {'err':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for level in results["levels"].values():
+        latency = level["latency"]
+        print(f"{level['concurrency']:>4} {level['requests']:>5} {fmt(level['throughput']):>7} "
+              f"{level['error_rate']:>6.1%} {fmt(latency['p50']):>8} {fmt(latency['p95']):>8} {fmt(latency['p99']):>8}")
+    for level in results["levels"].values():
+        print(f"\nConcurrency {level['concurrency']} by category / stage (p50 / p95 seconds):")
+        for name, stats in list(level["categories"].items()) + [(f"stage:{stage}", stats)
+                                                               for stage, stats in level["stages"].items()]:
+            print(f"  {name:<22} {fmt(stats['p50']):>8} / {fmt(stats['p95']):>8}  (n={stats['count']})")
+    if results.get("advanced"):
+        print("\nAdvancedWebAgent (p50 / p95 seconds):")
+        for method, stats in results["advanced"].items():
+            print(f"  {method:<22} {fmt(stats['p50']):>8} / {fmt(stats['p95']):>8}  (n={stats['count']})")
+
+def build_config(args, state_dir, ollama_url, site_url):
+    overrides = {
+        "BROWSER_POOL_SIZE": max(args.concurrency),
+        "HEADLESS": True,
+        # Benchmarks measure the work, not the caches: every level starts cold and identical
+        "LLM_CACHE_ENABLED": args.with_caches,
+        "LLM_CACHE_PATH": "",
+        "PAGE_CACHE_BYTES": CONFIG.PAGE_CACHE_BYTES if args.with_caches else 0,
+        "SEMANTIC_CACHE_ENABLED": args.with_caches,
+        "SEMANTIC_CACHE_PATH": os.path.join(state_dir, "semantic_cache"),
+        "SELECTOR_STATS_PATH": os.path.join(state_dir, "selector_stats.json"),
+        "PERSISTENT_PROFILE": False,
+        "WATCHDOG_INTERVAL": 0,
+    }
+    if ollama_url:
+        overrides["OLLAMA_HOST"] = ollama_url
+    if site_url:
+        overrides["SEARCH_ENGINE_URL"] = site_url + "/"
+        overrides["SITE_BASE_URL"] = site_url + "/sites/"
+    if args.task_timeout is not None:
+        overrides["TASK_TIMEOUT"] = args.task_timeout
+    return dataclasses.replace(CONFIG, **overrides)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebNavigatorAgent end to end")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--iterations", type=int, default=2, help="passes over the corpus per concurrency level")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured passes over one task per category")
+    parser.add_argument("--skip-advanced", action="store_true")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="fail when results regress against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed relative slowdown")
+    parser.add_argument("--real", action="store_true",
+                        help="use the configured Ollama and the real web instead of the local fakes")
+    parser.add_argument("--with-caches", action="store_true", help="keep the LLM, page and semantic caches on")
+    parser.add_argument("--task-timeout", type=float)
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0)
+    parser.add_argument("--first-token-latency", type=float, default=0.15)
+    parser.add_argument("--web-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+    ollama_url = site_url = None
+    servers = []
+    if not args.real:
+        settings = fake_ollama.FakeOllamaSettings(first_token_latency=args.first_token_latency,
+                                                  tokens_per_sec=args.tokens_per_sec)
+        server, ollama_url = fake_ollama.serve(port=0, settings=settings)
+        servers.append(server)
+        server, site_url = fixture_server.serve(port=0, site=fixture_server.FixtureSite(latency=args.web_latency))
+        servers.append(server)
+
+    state_dir = tempfile.mkdtemp(prefix="webnav-bench-")
+    agent = AdvancedWebAgent(build_config(args, state_dir, ollama_url, site_url))
+    try:
+        warmup_tasks = list({entry["category"]: entry for entry in corpus["tasks"]}.values())
+        for _ in range(args.warmup):
+            for entry in warmup_tasks:
+                run_task(agent, entry)
+        results = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                            "python": platform.python_version(),
+                            "platform": platform.platform(),
+                            "corpus": os.path.basename(args.corpus),
+                            "iterations": args.iterations,
+                            "fakes": not args.real,
+                            "tokens_per_sec": None if args.real else args.tokens_per_sec,
+                            "web_latency": None if args.real else args.web_latency},
+                   "levels": {}}
+        tasks = corpus["tasks"] * args.iterations
+        for concurrency in args.concurrency:
+            # Selector ordering learned by earlier levels would make later ones look faster
+            agent.selector_stats.clear()
+            print(f"Running {len(tasks)} tasks at concurrency {concurrency}...")
+            results["levels"][str(concurrency)] = run_level(agent, tasks, concurrency)
+        if not args.skip_advanced and corpus.get("advanced"):
+            print("Running AdvancedWebAgent methods...")
+            results["advanced"] = run_advanced(agent, corpus["advanced"], args.iterations)
+    finally:
+        agent.close()
+        for server in servers:
+            server.shutdown()
+
+    print_report(results)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
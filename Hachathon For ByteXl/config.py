@@ -0,0 +1,89 @@
+import os
+from dataclasses import dataclass, field
+from Tools.Blocking_Profiles import TASK_BLOCKING_PROFILES
+from LLM.context_builder import TASK_TOKEN_BUDGETS
+from LLM.model_router import DEFAULT_ROUTES
+
+def _keep_alive(value):
+    # Ollama takes seconds as a number or a duration string such as "30m"
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+@dataclass
+class AgentConfig:
+    # Browser pool
+    BROWSER_POOL_SIZE: int = int(os.environ.get("WEBNAV_POOL_SIZE", "2"))
+    BROWSER_MAX_PAGES: int = 50
+    BROWSER_MAX_AGE: float = 15 * 60
+    BROWSER_ACQUIRE_TIMEOUT: float = 60.0
+    HEADLESS: bool = True
+    # Persistent per-slot Chrome profiles with a sized HTTP disk cache
+    PERSISTENT_PROFILE: bool = False
+    PROFILE_ROOT: str = os.path.join(os.path.expanduser("~"), ".web_navigator", "profiles")
+    DISK_CACHE_SIZE: int = 256 * 1024 * 1024
+    PROFILE_MAX_BYTES: int = 1024 * 1024 * 1024
+    PROFILE_MAX_IDLE_DAYS: int = 7
+    # Browser health watchdog; 0 disables it
+    WATCHDOG_INTERVAL: float = 30.0
+    BROWSER_MAX_RSS_MB: int = 1500
+    BROWSER_MAX_LATENCY: float = 5.0
+    # ChromeDriver resolution; an explicit path skips webdriver-manager
+    CHROMEDRIVER_PATH: str = os.environ.get("WEBNAV_CHROMEDRIVER", "")
+    DRIVER_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".web_navigator", "chromedriver.json")
+    # Resource blocking: the startup profile is baked into Chrome prefs, the
+    # per-task profiles are switched at runtime
+    BLOCKING_PROFILE: str = "none"
+    TASK_BLOCKING_PROFILES: dict = field(default_factory=lambda: dict(TASK_BLOCKING_PROFILES))
+    # Serve static pages over plain HTTP before falling back to Selenium
+    HTTP_FAST_PATH: bool = True
+    HTTP_TIMEOUT: float = 10.0
+    # Page snapshot cache shared by the HTTP and browser backends
+    PAGE_CACHE_BYTES: int = 32 * 1024 * 1024
+    PAGE_CACHE_TTL: float = 300.0
+    # Learned result-selector ordering, persisted between runs
+    SELECTOR_STATS_PATH: str = os.path.join(os.path.expanduser("~"), ".web_navigator", "selector_stats.json")
+    # Search engine home page and, when set, a base URL that replaces the real
+    # sites in navigation tasks (bench/fixture_server.py serves both locally)
+    SEARCH_ENGINE_URL: str = os.environ.get("WEBNAV_SEARCH_URL", "google.com")
+    SITE_BASE_URL: str = os.environ.get("WEBNAV_SITE_BASE", "")
+    # Ollama client; an empty host falls back to OLLAMA_HOST / localhost
+    LLM_MODEL: str = "qwen2.5:0.5b"
+    OLLAMA_HOST: str = os.environ.get("OLLAMA_HOST", "")
+    LLM_KEEP_ALIVE: object = _keep_alive(os.environ.get("WEBNAV_LLM_KEEP_ALIVE", "-1"))
+    LLM_WARM_UP: bool = True
+    # Per-call-site model tiers (preferred first); models not pulled into Ollama are skipped
+    LLM_ROUTES: dict = field(default_factory=lambda: {site: list(models) for site, models in DEFAULT_ROUTES.items()})
+    LLM_ROUTE_MAX_QUEUE_DEPTH: int = 2
+    # LLM scheduler: concurrent generations, batch share and per-request timeout (0 = none)
+    LLM_MAX_CONCURRENCY: int = 2
+    LLM_MAX_BATCH_CONCURRENCY: int = 1
+    LLM_REQUEST_TIMEOUT: float = 0
+    # LLM response cache; an empty path keeps it in memory only
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".web_navigator", "llm_cache.sqlite3")
+    LLM_CACHE_TTL: float = 24 * 3600
+    LLM_CACHE_MEMORY_ENTRIES: int = 512
+    LLM_CACHE_DB_ENTRIES: int = 20000
+    # Prompt context budgets in tokens, per task type
+    CONTEXT_TOKEN_BUDGETS: dict = field(default_factory=lambda: dict(TASK_TOKEN_BUDGETS))
+    # Semantic cache of whole results for paraphrased requests, embedded with an
+    # Ollama model (ollama pull nomic-embed-text). An empty embed model uses
+    # Chroma's default model, but only if it was already downloaded
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_PATH: str = os.path.join(os.path.expanduser("~"), ".web_navigator", "semantic_cache")
+    SEMANTIC_CACHE_EMBED_MODEL: str = "nomic-embed-text"
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    SEMANTIC_CACHE_MAX_AGE: float = 3600.0
+    # Overlap browser acquisition, HTTP fast path, model preload and (optionally)
+    # structured planning instead of running them one after another
+    PIPELINED_EXECUTION: bool = True
+    PIPELINE_PLAN: bool = False
+    # Per-request deadline in seconds covering browser and LLM work (0 = none)
+    TASK_TIMEOUT: float = 90.0
+    # AdvancedWebAgent multi-site fan-out
+    MULTI_SITE_CONCURRENCY: int = 4
+    SITE_TIMEOUT: float = 60.0
+
+CONFIG = AgentConfig()
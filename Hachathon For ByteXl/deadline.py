@@ -0,0 +1,43 @@
+import threading
+import time
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+class Deadline:
+    """Absolute time budget for one task; a Deadline without seconds never expires"""
+
+    def __init__(self, seconds=None):
+        self.started_at = time.monotonic()
+        self.expires_at = None if seconds is None else self.started_at + seconds
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        """Seconds left, 0.0 once expired, or None when there is no limit"""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() == 0.0
+
+    def elapsed(self):
+        return time.monotonic() - self.started_at
+
+    def bound(self, timeout=None):
+        """Clamp a step timeout (None or 0 meaning unlimited) to the time left"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if not timeout:
+            return remaining
+        return min(timeout, remaining)
+
+    def check(self, what="task"):
+        if self.expired():
+            raise DeadlineExceeded(f"{what} exceeded the deadline after {self.elapsed():.1f}s")
+
+    def cancel(self):
+        self._cancelled.set()
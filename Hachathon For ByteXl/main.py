@@ -1,22 +1,151 @@
 from agent import Agent_core
 from LLM import llm_handler
+from LLM import llm_cache
+from LLM import llm_scheduler
+from LLM import context_builder
+from LLM import model_router
 from Tools import Browser_Tools
+from Tools import Browser_Pool
+from Tools import Browser_Profiles
+from Tools import Browser_Watchdog
+from Tools import Driver_Resolver
+from Tools import Http_Tools
 from Memory import Memory
+from Memory import Page_Cache
+from Memory import Selector_Stats
+from Memory import Semantic_Cache
+from config import CONFIG
+from deadline import Deadline
+import asyncio
+import threading
 import time
 import json
 
 class WebNavigatorAgent:
-    def __init__(self):
-        self.llm = llm_handler.LLMHandler()
-        self.browser = Browser_Tools.BrowserTools()
-        self.agent = Agent_core.WebAgent(self.llm, self.browser)
+    def __init__(self, config=None):
+        self.config = config or CONFIG
+        self.llm_cache = None
+        if self.config.LLM_CACHE_ENABLED:
+            self.llm_cache = llm_cache.LLMCache(
+                path=self.config.LLM_CACHE_PATH or None,
+                ttl=self.config.LLM_CACHE_TTL,
+                max_memory_entries=self.config.LLM_CACHE_MEMORY_ENTRIES,
+                max_db_entries=self.config.LLM_CACHE_DB_ENTRIES)
+        self.model_router = model_router.ModelRouter(self.config.LLM_MODEL, routes=self.config.LLM_ROUTES,
+                                                     max_queue_depth=self.config.LLM_ROUTE_MAX_QUEUE_DEPTH)
+        handler = llm_handler.LLMHandler(model=self.config.LLM_MODEL, cache=self.llm_cache,
+                                         host=self.config.OLLAMA_HOST or None,
+                                         keep_alive=self.config.LLM_KEEP_ALIVE,
+                                         router=self.model_router)
+        self.llm = llm_scheduler.LLMScheduler(
+            handler,
+            max_concurrency=self.config.LLM_MAX_CONCURRENCY,
+            max_batch_concurrency=self.config.LLM_MAX_BATCH_CONCURRENCY,
+            default_timeout=self.config.LLM_REQUEST_TIMEOUT or None)
+        self.context_builder = context_builder.ContextBuilder(self.config.LLM_MODEL,
+                                                              budgets=self.config.CONTEXT_TOKEN_BUDGETS)
+        if self.config.LLM_WARM_UP:
+            # Preload in the background so construction (and the Streamlit page) is not blocked
+            threading.Thread(target=self.llm.warm_up, daemon=True).start()
+        self.driver_resolver = Driver_Resolver.DriverResolver(
+            driver_path=self.config.CHROMEDRIVER_PATH or None,
+            cache_path=self.config.DRIVER_CACHE_PATH)
+        self.browser = self._new_browser()
+        self.page_cache = Page_Cache.PageCache(max_bytes=self.config.PAGE_CACHE_BYTES,
+                                               ttl=self.config.PAGE_CACHE_TTL)
+        self.selector_stats = Selector_Stats.SelectorStats(self.config.SELECTOR_STATS_PATH)
+        self.http = None
+        if self.config.HTTP_FAST_PATH:
+            self.http = Http_Tools.HttpTools(timeout=self.config.HTTP_TIMEOUT, page_cache=self.page_cache)
+        self.browser_pool = None
+        self.watchdog = None
+        if self.config.BROWSER_POOL_SIZE > 0:
+            profile_manager = None
+            if self.config.PERSISTENT_PROFILE:
+                profile_manager = Browser_Profiles.ProfileManager(
+                    self.config.PROFILE_ROOT,
+                    disk_cache_size=self.config.DISK_CACHE_SIZE,
+                    max_profile_bytes=self.config.PROFILE_MAX_BYTES,
+                    max_idle_days=self.config.PROFILE_MAX_IDLE_DAYS)
+            self.browser_pool = Browser_Pool.BrowserPool(
+                size=self.config.BROWSER_POOL_SIZE,
+                max_pages=self.config.BROWSER_MAX_PAGES,
+                max_age=self.config.BROWSER_MAX_AGE,
+                headless=self.config.HEADLESS,
+                browser_factory=self._new_browser,
+                blocking_profile=self.config.BLOCKING_PROFILE,
+                profile_manager=profile_manager)
+            self.browser_pool.warm(1)
+            if self.config.WATCHDOG_INTERVAL > 0:
+                self.watchdog = Browser_Watchdog.BrowserWatchdog(
+                    self.browser_pool,
+                    interval=self.config.WATCHDOG_INTERVAL,
+                    max_rss_mb=self.config.BROWSER_MAX_RSS_MB,
+                    max_latency=self.config.BROWSER_MAX_LATENCY).start()
+        self.agent = Agent_core.WebAgent(self.llm, self.browser, self.browser_pool,
+                                         acquire_timeout=self.config.BROWSER_ACQUIRE_TIMEOUT,
+                                         blocking_profiles=self.config.TASK_BLOCKING_PROFILES,
+                                         http_tools=self.http,
+                                         page_cache=self.page_cache,
+                                         selector_stats=self.selector_stats,
+                                         context_builder=self.context_builder,
+                                         pipelined=self.config.PIPELINED_EXECUTION,
+                                         plan=self.config.PIPELINE_PLAN,
+                                         search_url=self.config.SEARCH_ENGINE_URL,
+                                         site_base_url=self.config.SITE_BASE_URL or None)
         self.memory = Memory.AgentMemory()
+        self.semantic_cache = None
+        if self.config.SEMANTIC_CACHE_ENABLED:
+            embed_model = self.config.SEMANTIC_CACHE_EMBED_MODEL
+            self.semantic_cache = Semantic_Cache.SemanticCache(
+                self.config.SEMANTIC_CACHE_PATH,
+                embed_fn=(lambda text: self.llm.embed(text, embed_model)) if embed_model else None,
+                embed_model=embed_model or "default",
+                threshold=self.config.SEMANTIC_CACHE_THRESHOLD,
+                max_age=self.config.SEMANTIC_CACHE_MAX_AGE)
         
-    def process_request(self, user_input):
+    def _new_browser(self):
+        return Browser_Tools.BrowserTools(driver_resolver=self.driver_resolver)
+        
+    def _task_deadline(self, deadline):
+        if deadline is None and self.config.TASK_TIMEOUT:
+            return Deadline(self.config.TASK_TIMEOUT)
+        return deadline
+        
+    def process_request(self, user_input, on_token=None, priority=llm_scheduler.INTERACTIVE, deadline=None):
+        try:
+            start_time = time.time()
+            deadline = self._task_deadline(deadline)
+            cached = self._cached_result(user_input, start_time)
+            if cached is not None:
+                self.memory.add_task(user_input, cached)
+                return cached
+            with self.llm.priority(priority):
+                result = self.agent.execute_task(user_input, on_token, deadline)
+            result["execution_time"] = time.time() - start_time
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(user_input, result)
+            self.memory.add_task(user_input, result)
+            return result
+        except Exception as e:
+            error_result = {"status": "error", "message": str(e)}
+            self.memory.add_task(user_input, error_result)
+            return error_result
+
+    async def process_request_async(self, user_input, on_token=None, priority=llm_scheduler.INTERACTIVE,
+                                    deadline=None):
         try:
             start_time = time.time()
-            result = self.agent.execute_task(user_input)
+            deadline = self._task_deadline(deadline)
+            cached = await asyncio.to_thread(self._cached_result, user_input, start_time)
+            if cached is not None:
+                self.memory.add_task(user_input, cached)
+                return cached
+            with self.llm.priority(priority):
+                result = await self.agent.execute_task_async(user_input, on_token, deadline)
             result["execution_time"] = time.time() - start_time
+            if self.semantic_cache is not None:
+                await asyncio.to_thread(self.semantic_cache.store, user_input, result)
             self.memory.add_task(user_input, result)
             return result
         except Exception as e:
@@ -24,9 +153,38 @@ class WebNavigatorAgent:
             self.memory.add_task(user_input, error_result)
             return error_result
 
+    def _cached_result(self, user_input, start_time):
+        if self.semantic_cache is None:
+            return None
+        result, similarity = self.semantic_cache.lookup(user_input)
+        if result is None:
+            return None
+        result["cached"] = True
+        result["similarity"] = similarity
+        result["execution_time"] = time.time() - start_time
+        return result
+
     def get_task_history(self, count=5):
         return self.memory.get_recent_tasks(count)
 
+    def get_llm_routing_stats(self):
+        """Per-model latency percentiles and routing decisions, for tuning LLM_ROUTES"""
+        return self.model_router.get_stats()
+        
+    def get_browser_health(self):
+        if self.watchdog is None:
+            return None
+        return self.watchdog.report()
+
+    def close(self):
+        self.llm.close()
+        if self.agent.pipeline is not None:
+            self.agent.pipeline.close()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.browser_pool is not None:
+            self.browser_pool.close()
+
 if __name__ == "__main__":
     agent = WebNavigatorAgent()
     test_task = "Search for best laptops under $1000"